@@ -26,7 +26,7 @@ class MediaEngine:
     def __init__(self, ring_buffer, ring_lock, ws_handler=None):
         """
         Args:
-            ring_buffer: deque of PCM frames (shared with audio loop)
+            ring_buffer: StereoRing of S16 stereo frames (shared with audio loop)
             ring_lock: threading.Lock for ring_buffer access
             ws_handler: WebSocketHandler for state updates
         """
@@ -157,7 +157,7 @@ class MediaEngine:
             if len(data) > 0:
                 with self.lock:
                     num_frames = len(data) // 4
-                    self.buffer.extend([data[i*4:(i+1)*4] for i in range(num_frames)])
+                    self.buffer.write(data)  # One copy of the whole buffer into the ring
                     print(f"[MEDIA] Wrote {num_frames} frames to ring buffer, ring now has {len(self.buffer)} frames")
 
             return Gst.FlowReturn.OK
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import asyncio, os, errno, time, math, numpy as np
-import websockets, subprocess, sys, atexit, signal, json, fcntl, re
-import threading, queue
+import websockets, subprocess, sys, atexit, signal, json, fcntl, re, select, selectors, binascii
+import threading
 from pathlib import Path
 from collections import deque
 
@@ -23,6 +23,45 @@ except ImportError:
     SCIPY_AVAILABLE = False
     print("[FILTER] scipy not available, using simple FIR filter")
 
+# Try to import dbus-python to read BlueZ adapter state without forking bluetoothctl
+try:
+    import dbus
+    DBUS_AVAILABLE = True
+    print("[BT] D-Bus available for adapter state")
+except ImportError:
+    DBUS_AVAILABLE = False
+    print("[BT] dbus-python not available - adapter state via bluetoothctl")
+
+# Try to import pyudev so the output is re-opened on sound device hotplug events
+try:
+    import pyudev
+    PYUDEV_AVAILABLE = True
+    print("[AUDIO] pyudev available - watching for sound device hotplug")
+except ImportError:
+    PYUDEV_AVAILABLE = False
+    print("[AUDIO] pyudev not available - no sound device hotplug handling")
+
+# Try to import orjson for faster WebSocket message parsing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    print("[WS] Using orjson for message parsing")
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("[WS] orjson not available, using stdlib json")
+
+# Try to import uvloop for a faster asyncio event loop (WebSocket server, highlight sender)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+    print("[WS] Using uvloop event loop")
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    print("[WS] uvloop not available, using default asyncio loop")
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 os.environ['SDL_AUDIODRIVER'] = 'alsa'
 
 try:
@@ -55,6 +94,20 @@ except OSError: print("[FATAL] Another ws_audio.py is already running; exiting."
 RATE=48000; BLOCK=1200; CHANNELS=8; PORT=8081; DEVICE_NAME="ICUSBAUDIO7D"
 HEADSET_MAC="F4:4E:FD:01:F6:E9"  # Fosi Audio BT30D
 FADE_TIME=4.0; FADE_SAMPLES=int(FADE_TIME*RATE)
+PCM_RING_SLOTS=2; PCM_RING_MASK=PCM_RING_SLOTS-1  # Generator->writer blocks: one writing, one ahead
+BT_RING_FRAMES=8192; BT_RING_MASK=BT_RING_FRAMES-1  # BT capture ring (~170ms, power of two)
+MEDIA_RING_FRAMES=2*RATE  # Decoded media buffered ahead of the audio loop (~2s)
+PCM_SCALE=32767.0  # The mixer works in S16 units, so the PCM writer only has to round
+AUDIO_DEBUG=False  # Per-block tracing from the audio loop (a print there can stall it on stdout)
+BT_CAPTURE_PERIOD=BLOCK*2  # BT capture period: half the PCM reads of BLOCK, +25ms capture latency
+BTCTL_CACHE_TTL=1.0  # Seconds a read-only bluetoothctl query result is reused
+ALSA_PCM_CACHE_TTL=2.0  # Seconds an `aplay -L` listing is reused
+WS_MAX_MESSAGE=1024*1024  # Largest inbound WebSocket message accepted
+WS_CLIENT_BACKLOG_MAX=256*1024  # Bytes unsent to one client before it counts as stalled and is dropped
+BTCTL_QUERIES=frozenset({"show","info","devices","paired-devices"})  # Commands that change nothing
+BT_MAC_RE=re.compile(r'Device\s+([0-9A-F:]{17})', re.I)  # MACs from bluetoothctl device lists
+BT_DEVICE_RE=re.compile(r'Device\s+([0-9A-F:]{17})\s+(.+)', re.I)  # (MAC, name) pairs
+WIFI_FRAME_SAMPLES=BLOCK*CHANNELS; WIFI_FRAME_BYTES=WIFI_FRAME_SAMPLES*4  # One float32 WiFi stream frame
 CHANNEL_MAP={"neck":(0,1),"back":(2,3),"thighs":(4,5),"legs":(6,7)}
 MODE_ROUTING={
 0:{0:[0,1],1:[2,3],2:[4,5],3:[6,7]},
@@ -66,6 +119,25 @@ MODE_ROUTING={
 6:{0:[0,3],1:[1,2],2:[4,7],3:[5,6]},
 7:{0:[0,6],1:[1,7],2:[3,5],3:[2,4]}}
 
+def _routing_perm(routing):
+    """MODE_ROUTING entry -> output index feeding each speaker (-1 where none does)"""
+    perm = np.full(CHANNELS, -1, dtype=np.int8)
+    for output_idx, speaker_list in routing.items():
+        if output_idx < 4:
+            for speaker_idx in speaker_list:
+                if 0 <= speaker_idx < CHANNELS:
+                    perm[speaker_idx] = output_idx
+    return perm
+
+# Routing tables built once at import: per-mode speaker->output permutations, and the
+# (4 outputs, CHANNELS) 0/1 matrices the audio loop routes with (unfed speakers get a zero column)
+MODE_PERMS={mode: _routing_perm(routing) for mode, routing in MODE_ROUTING.items()}
+MODE_MATRICES={mode: (perm[None, :] == np.arange(4)[:, None]).astype(np.float32) for mode, perm in MODE_PERMS.items()}
+# Speaker -> CHANNEL_MAP column, so per-column gains expand to all speakers in one gather
+CHANNEL_COL_IDX=np.empty(CHANNELS, dtype=np.intp)
+for _col_idx, _chans in enumerate(CHANNEL_MAP.values()):
+    CHANNEL_COL_IDX[list(_chans)] = _col_idx
+
 CONFIG_PATH=Path.home()/ "webui"/ "config.json"
 
 def load_config():
@@ -88,9 +160,7 @@ def apply_dual_strength(matrix_val: int, user_val: int | None, min_limit=0, max_
         scale = 1.0 + (user_val - 5) / 5.0
         return int(min(max_limit, round(matrix_val * scale)))
 
-def scaled_amp(strength_step: int, trim_step: int) -> float:
-    strength_step = max(0, min(9, strength_step))
-    trim_step = max(0, min(9, trim_step))
+def _scaled_amp_impl(strength_step: int, trim_step: int) -> float:
     base = strength_step * 10
     if trim_step == 5:
         amp = base
@@ -100,6 +170,101 @@ def scaled_amp(strength_step: int, trim_step: int) -> float:
         amp = base + (trim_step - 5) * ((90 - base) / 5)
     return amp / 90.0
 
+# Both steps are integers 0..9, so the whole gain curve is a 10x10 table built at import
+# (float32, the dtype the audio path applies gains in)
+_AMP_TABLE=np.array([[_scaled_amp_impl(s, t) for t in range(10)] for s in range(10)], dtype=np.float32)
+
+def scaled_amp(strength_step: int, trim_step: int) -> float:
+    return float(_AMP_TABLE[max(0, min(9, strength_step)), max(0, min(9, trim_step))])
+
+# ---- WiFi frame ring ----
+class AudioRing:
+    """Fixed ring of preallocated float32 frames: one producer (WS handler), one consumer
+    (audio loop). head/tail count frames monotonically; the producer fills the slot at
+    head outside the lock, since the consumer only ever touches slots in [tail, head)"""
+
+    def __init__(self, slots: int, frame_size: int):
+        self.slots = slots
+        self.buffers = np.empty((slots, frame_size), dtype=np.float32)
+        self.head = 0
+        self.tail = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.head - self.tail
+
+    def reserve_write(self):
+        """Slot to fill for the next frame, or None if the ring is full"""
+        if self.head - self.tail >= self.slots:
+            return None
+        return self.buffers[self.head % self.slots]
+
+    def commit_write(self):
+        """Publish the slot returned by reserve_write"""
+        with self.lock:
+            self.head += 1
+
+    def pop_into(self, out) -> bool:
+        """Copy the oldest frame into out; False if empty"""
+        with self.lock:
+            if self.head == self.tail:
+                return False
+            out[:] = self.buffers[self.tail % self.slots].reshape(out.shape)
+            self.tail += 1
+        return True
+
+    def drop_to(self, depth) -> int:
+        """Discard the oldest frames until at most depth remain; returns frames dropped"""
+        with self.lock:
+            dropped = max(0, self.head - self.tail - depth)
+            self.tail += dropped
+        return dropped
+
+    def clear(self):
+        with self.lock:
+            self.tail = self.head
+
+# ---- Media PCM ring ----
+class StereoRing:
+    """Fixed ring of S16 stereo frames, fed raw PCM bytes by the GStreamer appsink thread
+    and drained a block at a time by the audio loop: one slice copy in per buffer, one
+    out per block. Positions count frames monotonically; both sides hold the shared lock"""
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.buffer = np.zeros((frames, 2), dtype=np.int16)
+        self.write_pos = 0
+        self.read_pos = 0
+
+    def __len__(self):
+        return self.write_pos - self.read_pos
+
+    def write(self, data):
+        """Append S16_LE stereo bytes, overwriting the oldest frames on overflow"""
+        stereo = np.frombuffer(data, dtype=np.int16, count=(len(data) // 4) * 2).reshape(-1, 2)
+        n = len(stereo)
+        if n > self.frames:
+            # Only the newest `frames` frames survive
+            stereo = stereo[-self.frames:]
+        count = len(stereo)
+        start = (self.write_pos + n - count) % self.frames
+        first = min(count, self.frames - start)
+        self.buffer[start:start + first] = stereo[:first]
+        self.buffer[:count - first] = stereo[first:]
+        self.write_pos += n
+        if self.write_pos - self.read_pos > self.frames:
+            self.read_pos = self.write_pos - self.frames
+
+    def read_into(self, out) -> int:
+        """Copy up to len(out) of the oldest frames into out; returns frames copied"""
+        count = min(len(out), self.write_pos - self.read_pos)
+        start = self.read_pos % self.frames
+        first = min(count, self.frames - start)
+        out[:first] = self.buffer[start:start + first]
+        out[first:count] = self.buffer[:count - first]
+        self.read_pos += count
+        return count
+
 # ---- Player ----
 class SineRowPlayer:
     def __init__(self, ws_handler=None):
@@ -123,15 +288,21 @@ class SineRowPlayer:
         self.bt_lpf_fc = 200.0
         self._bt_lpf_sos = None  # Use scipy SOS (second-order sections) format
         self._bt_lpf_zi = None   # Filter initial conditions
+        self._init_bt_lpf()
         self._bt_reinit_cooldown_s = 5.0
         self._bt_last_reinit = 0.0
         
         # Ring buffer for BT audio (8x buffer size for more stability)
-        self.bt_ring_buffer = np.zeros((BLOCK * 8, 2), dtype=np.float32)
+        # Stored as raw int16 PCM; converted to float32 only when the audio loop consumes it
+        # Lock-free single-producer (BT read thread) / single-consumer (audio loop):
+        # positions count frames monotonically and are masked into the ring, the writer
+        # only advances bt_ring_write_pos and the reader only bt_ring_read_pos
+        self.bt_ring_buffer = np.zeros((BT_RING_FRAMES, 2), dtype=np.int16)
         self.bt_ring_write_pos = 0
         self.bt_ring_read_pos = 0
-        self.bt_ring_fill = 0
-        self.bt_ring_lock = threading.Lock()
+        self._bt_ring_discard = False  # Asks the reader to drop everything buffered
+        self._underrun_count = 0  # BT ring underruns since the last [BT] UNDERRUN report
+        self._last_underrun_log = time.perf_counter()
         
         # BT read thread
         self.bt_read_thread = None
@@ -139,12 +310,18 @@ class SineRowPlayer:
         
         # WiFi streaming mode with adaptive jitter buffer
         self.wifi_stream_enabled = False
-        self.wifi_audio_queue = queue.Queue(maxsize=20)
+        # Frames live in a fixed ring of preallocated slots: the WS handler copies
+        # into the next free slot, the audio loop copies out of the oldest
+        self.wifi_audio_ring = AudioRing(20, BLOCK * CHANNELS)
         self.wifi_stream_underruns = 0
         self.wifi_stream_overruns = 0
-        self.wifi_stream_min_buffer = 2      # Very low latency - only 2 frames (50ms)
-        self.wifi_stream_target_latency = 3  # Target 3 frames (75ms)
+        self.wifi_stream_min_buffer = 2      # Very low latency - never target below 2 frames (50ms)
+        self.wifi_stream_target_latency = 3  # Target 3 frames (75ms), adapted to measured jitter
         self.wifi_stream_max_latency = 8     # Drop frames if above 8 (200ms)
+        self.wifi_jitter_ewma = 0.0          # Smoothed frame arrival jitter (seconds)
+        self.wifi_last_arrival = None
+        self.wifi_last_latency_check = time.perf_counter()
+        self.wifi_clean_since = time.perf_counter()
         self.wifi_stream_last_stats = time.perf_counter()
         self.wifi_stream_frames_received = 0
         self.wifi_stream_frames_dropped = 0
@@ -158,7 +335,7 @@ class SineRowPlayer:
         self.headset_mac = HEADSET_MAC
 
         # Media engine (GStreamer-based playback)
-        self.media_ring = deque(maxlen=96000)  # ~2 second buffer at 48kHz stereo
+        self.media_ring = StereoRing(MEDIA_RING_FRAMES)
         self.media_ring_lock = threading.Lock()
         self.media_engine = None
         self.media_gain = 2.0  # Volume control for media (amplify to compensate for low source amplitude)
@@ -181,7 +358,7 @@ class SineRowPlayer:
         self.fade_samples_remaining = 0
         self.fade_direction = 0
         self.fade_multiplier = 0.0
-        self.row_start_time = 0.0
+        self.row_samples = 0  # Samples generated for the current row: the row clock
 
         # Pause/Resume state
         self.is_paused = False
@@ -190,8 +367,60 @@ class SineRowPlayer:
         self.saved_state = None
         self.pause_start_time = 0.0
 
+        # Preallocated per-block buffers (reused every audio loop iteration)
+        self._mix_buf = np.zeros((BLOCK, CHANNELS), dtype=np.float32)
+        self._therapy_scratch = np.zeros((BLOCK, CHANNELS), dtype=np.float32)
+        self._bt_mono = np.empty(BLOCK, dtype=np.float32)
+        self._bt_silence = np.zeros((BLOCK, 2), dtype=np.float32)  # BT input while disabled (never written)
+        self._bt_i16 = np.empty((BLOCK, 2), dtype=np.int16)        # Frames copied out of the BT ring
+        self._bt_stereo = np.empty((BLOCK, 2), dtype=np.float32)   # ...and as float
+        self._media_i16 = np.zeros((BLOCK, 2), dtype=np.int16)     # Frames copied out of the media ring
+        self._media_stereo = np.zeros((BLOCK, 2), dtype=np.float32)  # ...and as float
+        self._media_scaled = np.empty((BLOCK, 2), dtype=np.float32)
+        self._headset_src = None  # Full-band S16 stereo for the headset, set per block by the mixer
+        # Generator -> writer ring: each slot holds one chair block and one headset block
+        self._pcm_slots = [np.empty((BLOCK, CHANNELS), dtype=np.int16) for _ in range(PCM_RING_SLOTS)]
+        self._headset_slots = [np.empty((BLOCK, 2), dtype=np.int16) for _ in range(PCM_RING_SLOTS)]
+        self._pcm_writer = None  # Writer thread of the current (or last) audio loop run
+        self._k_block = np.arange(BLOCK, dtype=np.float32)  # Sample index ramp 0..BLOCK-1
+        self._fade_ramp = self._k_block / FADE_SAMPLES  # Per-sample fade progress steps
+        self._fade_env = np.empty(BLOCK, dtype=np.float32)
+        self._phi_buf = np.empty(BLOCK, dtype=np.float32)  # Carrier phase scratch
+        self._phi_tmp = np.empty(BLOCK, dtype=np.float32)
+        self._carrier = np.empty(BLOCK, dtype=np.float32)  # Carrier output (read-only downstream)
+        self._mod_env = np.empty((BLOCK, 4), dtype=np.float32)  # Per-output LFO envelope -> modulated outputs
+        self._carrier_inc = None  # Phase increment the cached carrier basis was built for
+        self._carrier_cos = None
+        self._carrier_sin = None
+        # Per-row constants, refreshed by _cache_row() whenever self.row is assigned
+        self._row_f0 = 20.0
+        self._row_fsweep = 0.0
+        self._row_sspd = 0.0
+        self._row_dur = 60.0
+        self._row_mode = 0
+        self._row_fade_start = 60.0 - FADE_TIME
+        self._row_route = MODE_MATRICES[0]
+        self._row_strength = 5
+        self._row_trims = {col: 5 for col in CHANNEL_MAP}
+        self._mod_fn = None  # Modulation stage specialized for the current row (see _build_mod_fn)
+        # Speaker gains (row strength/trims + user controls) and the routing matrix they are
+        # folded into with therapy_gain; rebuilt by _rebuild_route_gains() only when marked dirty
+        self._base_gains = np.zeros(CHANNELS, dtype=np.float32)
+        self._row_effective = np.zeros((4, CHANNELS), dtype=np.float32)
+        self._gains_therapy_mix = None
+        self._gains_dirty = True
+        self._alsa_process = None  # Chair DAC aplay, started by ensure_stream()
+        self._audio_running = False  # Audio loop + PCM writer threads running
+        self._stream_lock = threading.Lock()  # ensure_stream runs on the loop and in the executor
+
         self.ensure_stream()
            
+    def set_user_control(self, control, value):
+        """Set a user strength/trim control (user_strength, user_neck, ...) and mark the
+        cached speaker gains for rebuild on the next block"""
+        setattr(self, control, value)
+        self._gains_dirty = True
+
     def request_pause(self):
         """Request a pause with fade-out"""
         if self.row and not self.is_paused and not self.pause_requested:
@@ -211,8 +440,7 @@ class SineRowPlayer:
         if not self.row:
             return None
             
-        current_time = time.perf_counter()
-        elapsed_time = current_time - self.row_start_time
+        elapsed_time = self.row_samples / RATE
         
         state = {
             'row_data': dict(self.row),
@@ -236,6 +464,7 @@ class SineRowPlayer:
             
         try:
             self.row = state['row_data']
+            self._cache_row()
             self.sequence_rows = state['sequence_rows'] 
             self.current_row_index = state['current_row_index']
             self.is_playing_sequence = state['is_playing_sequence']
@@ -243,8 +472,7 @@ class SineRowPlayer:
             self.mod_phase_accum = state['mod_phase_accum']
             self.last_inst_f = state['last_inst_f']
             
-            current_time = time.perf_counter()
-            self.row_start_time = current_time - state['elapsed_time']
+            self.row_samples = int(round(state['elapsed_time'] * RATE))
             
             self.is_paused = False
             self._start_fade_in()
@@ -289,7 +517,7 @@ class SineRowPlayer:
                         self.headset_process = None
             
             # If ALSA output is already running, don't restart it
-            if hasattr(self, '_alsa_process') and self._alsa_process:
+            if self._alsa_process is not None:
                 if self._alsa_process.poll() is None:  # Still running
                     return True
 
@@ -306,6 +534,14 @@ class SineRowPlayer:
             stderr=subprocess.DEVNULL,
             bufsize=0)
 
+            # The audio loop is paced by this pipe blocking, so keep its buffer near one
+            # block (kernel rounds up to pages) instead of the 64 KiB default (~3.4 blocks)
+            try:
+                fcntl.fcntl(self._alsa_process.stdin.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031),
+                            BLOCK * CHANNELS * 2)
+            except OSError:
+                pass
+
             # --- Loopback writer DISABLED ---
             # The bridge (bluealsa-aplay) now owns Loopback,0
             # App reads from Loopback,1 via loopback fallback; headset gets direct _write_headset()
@@ -324,32 +560,39 @@ class SineRowPlayer:
             return False
      
     def _generate_therapy_audio(self, frames):
-        """Generate therapy audio - BT read happens first for consistent timing"""
+        """Generate therapy audio - BT read happens first for consistent timing.
+        Returns the mixed block in S16 units (saturated to +-PCM_SCALE)"""
         try:
             # ---- Read BT audio FIRST before any therapy processing ----
-            bt_stereo = np.zeros((frames, 2), dtype=np.float32)
             if self.bt_enabled:
                 bt_stereo = self._read_bt_from_ring(frames)
+            else:
+                bt_stereo = self._bt_silence[:frames]
             
-            # Initialize therapy signal
-            therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
+            # WiFi blocks land in a reused scratch buffer and are scaled into the mix later.
+            # Generated therapy is routed straight into the mix block with therapy_gain
+            # folded into the speaker gains (therapy_in_mix), skipping a full pass
+            therapy_signal = self._therapy_scratch[:frames]
+            mixed_signal = self._mix_buf[:frames]
+            therapy_mix_gain = float(self.therapy_gain)
+            therapy_in_mix = False
             
              # WiFi streaming mode - use external audio with adaptive buffering
             if self.wifi_stream_enabled:
                 try:
-                    queue_depth = self.wifi_audio_queue.qsize()
+                    queue_depth = len(self.wifi_audio_ring)
                     
                     # Initial buffering phase - wait until we have minimum buffer
                     if self.wifi_stream_is_buffering:
-                        if queue_depth >= self.wifi_stream_min_buffer:
+                        if queue_depth >= self.wifi_stream_target_latency:
                             self.wifi_stream_is_buffering = False
                             print(f"[WIFI] Buffering complete, starting playback with {queue_depth} frames")
                         else:
                             # Still buffering - output silence
-                            therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
+                            therapy_signal.fill(0.0)
                             now = time.perf_counter()
                             if now - self.wifi_stream_last_stats >= 2.0:
-                                print(f"[WIFI] Buffering... ({queue_depth}/{self.wifi_stream_min_buffer} frames)")
+                                print(f"[WIFI] Buffering... ({queue_depth}/{self.wifi_stream_target_latency} frames)")
                                 self.wifi_stream_last_stats = now
                             # Don't increment underruns during intentional buffering
                     else:
@@ -357,15 +600,10 @@ class SineRowPlayer:
                         
                         # Drop excess frames if queue is too full (prevents latency buildup)
                         if queue_depth > self.wifi_stream_max_latency:
-                            frames_to_drop = queue_depth - self.wifi_stream_target_latency
-                            for _ in range(frames_to_drop):
-                                try:
-                                    self.wifi_audio_queue.get_nowait()
-                                    self.wifi_stream_frames_dropped += 1
-                                except queue.Empty:
-                                    break
+                            frames_to_drop = self.wifi_audio_ring.drop_to(self.wifi_stream_target_latency)
+                            self.wifi_stream_frames_dropped += frames_to_drop
                             print(f"[WIFI] Dropped {frames_to_drop} frames (queue was {queue_depth})")
-                            queue_depth = self.wifi_audio_queue.qsize()
+                            queue_depth = len(self.wifi_audio_ring)
                         
                         # Print stats every 5 seconds
                         now = time.perf_counter()
@@ -379,35 +617,30 @@ class SineRowPlayer:
                             self.wifi_stream_last_stats = now
                             self.wifi_stream_frames_received = 0
                             self.wifi_stream_frames_dropped = 0
+
+                        self._wifi_adapt_latency(now)
                         
                         # Check if buffer is running low - restart buffering if needed
                         if queue_depth == 0:
                             self.wifi_stream_is_buffering = True
                             self.wifi_stream_underruns += 1
-                            therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
+                            self._wifi_adapt_latency(now, underrun=True)
+                            therapy_signal.fill(0.0)
                             print(f"[WIFI] Buffer empty, restarting buffering phase")
                         else:
-                            # Try to get frame with short timeout
-                            try:
-                                wifi_data = self.wifi_audio_queue.get(timeout=0.010)  # 10ms timeout
+                            if self.wifi_audio_ring.pop_into(therapy_signal):
                                 self.wifi_stream_frames_received += 1
-                                
-                                if len(wifi_data) == frames * CHANNELS:
-                                    therapy_signal = wifi_data.reshape((frames, CHANNELS))
-                                else:
-                                    print(f"[WIFI] Size mismatch: expected {frames*CHANNELS}, got {len(wifi_data)}")
-                                    therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
-                                    self.wifi_stream_underruns += 1
-                            except queue.Empty:
+                            else:
                                 # Buffer underrun - restart buffering
                                 self.wifi_stream_is_buffering = True
                                 self.wifi_stream_underruns += 1
-                                therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
+                                self._wifi_adapt_latency(now, underrun=True)
+                                therapy_signal.fill(0.0)
                                 print(f"[WIFI] Underrun detected, restarting buffering")
                                 
                 except Exception as e:
                     print(f"[WIFI] Error: {e}")
-                    therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
+                    therapy_signal.fill(0.0)
                         
             else:
                 # Normal therapy generation
@@ -436,31 +669,26 @@ class SineRowPlayer:
                         print("[RESUME] Failed to restore state")
                         self.resume_requested = False
                 
-                # Initialize signals
-                therapy_signal = np.zeros((frames, CHANNELS), dtype=np.float32)
-                
                 # Generate therapy audio ONLY if active and not paused
                 row = self.row
                 if row and not self.is_paused:
-                    dt = 1.0 / RATE
-                    tt_block = np.arange(frames) * dt
-                    f0 = min(float(row.get("frequency", 20.0)), 150.0)  # Limit to 150Hz max
-                    fsweep = float(row.get("freqSweep", 0))
-                    sspd = float(row.get("sweepSpeed", 0))
-                    dur = float(row.get("time", 60))
-                    phase = float(row.get("phase", 90))  # This now controls MODULATION phase
-                    mode = int(row.get("mode", 0))
-                    mod_val = float(row.get("modSpeed", 5))
-                    
-                    # Logarithmic mapping: slider 1-100 ? 0.03-10 Hz
-                    f_min, f_max, N = 0.03, 10.0, 100
-                    mod_freq = f_min * (f_max / f_min) ** ((mod_val - 1) / (N - 1))
+                    # Snapshot the cached row constants: a sequence transition below
+                    # swaps them, but this block finishes with the row it started on
+                    f0 = self._row_f0
+                    fsweep = self._row_fsweep
+                    sspd = self._row_sspd
+                    dur = self._row_dur
+                    fade_start_time = self._row_fade_start
+                    if self._gains_dirty or therapy_mix_gain != self._gains_therapy_mix:
+                        self._rebuild_route_gains(therapy_mix_gain)
+                    effective = self._row_effective
+                    mod_fn = self._mod_fn
                         
-                    current_time = time.perf_counter()
-                    t0 = current_time - self.row_start_time
-                    fade_start_time = dur - FADE_TIME
+                    # Row time comes from the samples generated, not the wall clock: it
+                    # follows the audio actually handed to aplay and cannot drift from it
+                    t0 = self.row_samples / RATE
                     
-                    if t0 >= fade_start_time and self.fade_direction == 0 and dur > FADE_TIME and not self.pause_requested:
+                    if t0 >= fade_start_time and self.fade_direction == 0 and not self.pause_requested:
                         print(f"[FADE] Starting fade-out at t={t0:.2f}s")
                         self._start_fade_out()
 
@@ -470,7 +698,7 @@ class SineRowPlayer:
                             if next_index < len(self.sequence_rows):
                                 print(f"[SEQ] Transitioning from row {self.current_row_index} to {next_index}")
                                 self._start_sequence_row(next_index)
-                                t0 = current_time - self.row_start_time
+                                t0 = 0.0
                             else:
                                 print("[SEQ] Sequence complete")
                                 if self.ws_handler:
@@ -491,111 +719,108 @@ class SineRowPlayer:
                     if self.row:
                         audio_t0 = min(t0, dur)
                         
-                        # Generate 4-channel audio (carriers without phase offset)
-                        audio_outputs = self._generate_4_channel_audio(f0, fsweep, sspd, audio_t0, tt_block, frames)
-
-                        # Apply modulation with phase control
-                        if mod_freq > 0:
-                            # Sine wave modulation with phase control
-                            w = 2 * np.pi * mod_freq
-                            phi0 = self.mod_phase_accum
-                            k = np.arange(frames, dtype=np.float32)
-                            
-                            modulated_outputs = np.zeros_like(audio_outputs)
-                            for output_idx in range(4):
-                                # Apply phase offset to modulation for each output
-                                phase_offset_rad = np.deg2rad(phase * output_idx)
-                                mod_phi = phi0 + w * dt * k + phase_offset_rad
-                                mod_lfo = np.sin(mod_phi)
-                                amp_env = (mod_lfo + 1.0) * 0.5
-                                modulated_outputs[:, output_idx] = audio_outputs[:, output_idx] * amp_env
-                            
-                            self.mod_phase_accum = (phi0 + w * dt * frames) % (2*np.pi)
-                        else:
-                            modulated_outputs = audio_outputs
-
-                        speaker_signals = self._route_audio_to_speakers(modulated_outputs, mode)
-
-                        matrix_master = int(row.get("strength", 5))
-                        user_master = getattr(self, "user_strength", None)
-                        final_master = apply_dual_strength(matrix_master, 
-                                                            int(user_master) if user_master is not None else None)
-
-                        base_gains = np.zeros(CHANNELS, dtype=np.float32)
-                        for col, chans in CHANNEL_MAP.items():
-                            matrix_trim = int(row.get(col, 5))
-                            user_trim = getattr(self, f"user_{col}", None)
-                            final_trim = apply_dual_strength(matrix_trim, 
-                                                              int(user_trim) if user_trim is not None else None)
-                            g = scaled_amp(final_master, final_trim)
-                            for c in chans:
-                                base_gains[c] = g
-
-                        therapy_signal = speaker_signals * base_gains[None, :]
-                        therapy_signal = self._apply_fade(therapy_signal, frames)
-
-            # ---- BT audio processing (already read at start) ----
-            bt_8 = None
-            if self.bt_gain > 0.0:
-                bt_8 = self._bt_to_8ch(bt_stereo)
+                        # All 4 outputs share the SAME carrier (in-phase); it is generated once
+                        carrier = self._generate_carrier(f0, fsweep, sspd, audio_t0, frames)
+
+                        # Fade envelope on the single carrier column: modulation, routing and
+                        # gains are all linear per sample, so this is the same as fading the
+                        # 8ch result at 1/8 of the work
+                        self._apply_fade(carrier, frames)
+
+                        # Apply modulation with phase control (specialized when the row was set);
+                        # this is where the carrier fans out to the 4 outputs
+                        modulated_outputs = mod_fn(carrier, frames)
+
+                        self._route_audio_to_speakers(modulated_outputs, effective, mixed_signal)
+                        self.row_samples += frames
+                        therapy_in_mix = True
+
+                if not therapy_in_mix:
+                    mixed_signal.fill(0.0)
+                    therapy_in_mix = True
 
-            # Mix therapy + BT
+            # Mix therapy + BT (BT already read at start)
             music_gain = float(self.bt_gain)
-            therapy_mix_gain = float(getattr(self, "therapy_gain", 2.0))
 
             # Read and mix media audio (if available)
             media_stereo = self._read_media_from_ring(frames)
-            media_8ch = np.zeros((frames, CHANNELS), dtype=np.float32)
-            if np.any(media_stereo):
-                # Media gets full bandwidth (no 200Hz filter like BT)
-                media_8ch[:, 0::2] = media_stereo[:, 0:1]  # Spread across channels like stereo BT
-                media_8ch[:, 1::2] = media_stereo[:, 1:2]
+            has_media = bool(np.any(media_stereo))
 
             # Apply media volume gain
-            media_gain = float(getattr(self, "media_gain", 1.0))
+            media_gain = float(self.media_gain)
 
-            if bt_8 is not None:
-                mixed_signal = therapy_signal * therapy_mix_gain + bt_8 * music_gain + media_8ch * media_gain
+            # Mix into the persistent output block in place: the therapy term is already
+            # there (or the WiFi block is scaled in now), BT/media accumulate on top
+            if not therapy_in_mix:
+                np.multiply(therapy_signal, therapy_mix_gain * PCM_SCALE, out=mixed_signal)
+            if self.bt_gain > 0.0:
+                self._bt_to_8ch(bt_stereo, music_gain * PCM_SCALE, mixed_signal)
+            if has_media:
+                # Media gets full bandwidth (no 200Hz filter like BT), spread across channels like stereo BT.
+                # Gain goes into a scratch block: media_stereo itself feeds the headset unscaled
+                media_scaled = np.multiply(media_stereo, media_gain * PCM_SCALE, out=self._media_scaled[:frames])
+                mixed_signal[:, 0::2] += media_scaled[:, 0:1]
+                mixed_signal[:, 1::2] += media_scaled[:, 1:2]
+
+            # Saturate at full scale (the S16 factor is folded into every gain above)
+            np.clip(mixed_signal, -PCM_SCALE, PCM_SCALE, out=mixed_signal)
+
+            # Store unfiltered media audio for headset (unfiltered full-range). The S16
+            # frames as read from the ring: the PCM writer only has to copy them
+            if has_media:
+                self._headset_src = self._media_i16[:frames]
+            elif self.bt_gain > 0.0 and self.bt_enabled:
+                self._headset_src = self._bt_i16[:frames]
             else:
-                mixed_signal = therapy_signal * therapy_mix_gain + media_8ch * media_gain
-
-            np.clip(mixed_signal, -1.0, 1.0, out=mixed_signal)
-
-            # Store unfiltered media audio for headset (unfiltered full-range)
-            self._bt_stereo_unfiltered = media_stereo if np.any(media_stereo) else (bt_stereo if self.bt_gain > 0.0 else None)
+                self._headset_src = None  # Silence (BT disabled reads as silence too)
 
             return mixed_signal
             
         except Exception as e:
             print(f"[AUDIO] Generation error: {e}")
-            return np.zeros((frames, CHANNELS), dtype=np.float32)
+            # Silence in the reused mix block - the error path allocates nothing either
+            silence = self._mix_buf[:frames]
+            silence.fill(0.0)
+            return silence
                 
-    def _biquad_process_stereo(self, x_stereo, coeffs, state):
-        """Process 2-ch block with biquad filter - OPTIMIZED vectorized version"""
-        if coeffs is None:
-            return x_stereo
-        
-        b0, b1, b2, a1, a2 = coeffs
-        frames = x_stereo.shape[0]
-        y = np.empty_like(x_stereo, dtype=np.float32)
-        
-        # Process both channels using vectorized operations
-        for ch in (0, 1):
-            z1, z2 = float(state[ch, 0]), float(state[ch, 1])
-            xs = x_stereo[:, ch]
-            ys = np.empty(frames, dtype=np.float32)
-            
-            # Vectorized biquad using scipy.signal approach
-            # Direct Form II transposed
-            for i in range(frames):
-                ys[i] = b0 * xs[i] + z1
-                z1 = b1 * xs[i] - a1 * ys[i] + z2
-                z2 = b2 * xs[i] - a2 * ys[i]
-            
-            state[ch, 0], state[ch, 1] = z1, z2
-            y[:, ch] = ys
-        
-        return y
+    def wifi_push(self, samples) -> bool:
+        """Copy one WiFi frame into the next ring slot; False if the ring is full"""
+        # Track arrival jitter (deviation from the nominal frame period) as an EWMA
+        now = time.perf_counter()
+        if self.wifi_last_arrival is not None:
+            deviation = abs((now - self.wifi_last_arrival) - BLOCK / RATE)
+            self.wifi_jitter_ewma = 0.9 * self.wifi_jitter_ewma + 0.1 * deviation
+        self.wifi_last_arrival = now
+
+        slot = self.wifi_audio_ring.reserve_write()
+        if slot is None:
+            return False
+        slot[:] = samples
+        self.wifi_audio_ring.commit_write()
+        return True
+
+    def _wifi_adapt_latency(self, now, underrun=False):
+        """Adapt the WiFi jitter-buffer target: +1 frame per underrun, sized from the
+        arrival jitter every 10s, and -1 frame after 30s of clean playback"""
+        target = self.wifi_stream_target_latency
+        if underrun:
+            target += 1
+            self.wifi_clean_since = now
+        elif now - self.wifi_last_latency_check >= 10.0:
+            self.wifi_last_latency_check = now
+            if now - self.wifi_clean_since >= 30.0:
+                target -= 1
+                self.wifi_clean_since = now
+            jitter_frames = int(math.ceil(self.wifi_jitter_ewma * RATE / BLOCK)) + 1
+            target = max(target, jitter_frames)
+        else:
+            return
+
+        target = max(self.wifi_stream_min_buffer, min(self.wifi_stream_max_latency - 1, target))
+        if target != self.wifi_stream_target_latency:
+            print(f"[WIFI] Target latency {self.wifi_stream_target_latency} -> {target} frames "
+                  f"(jitter {self.wifi_jitter_ewma * 1000:.1f}ms)")
+            self.wifi_stream_target_latency = target
 
     def _bt_read_loop(self):
         """Background thread to continuously read BT audio into ring buffer"""
@@ -605,17 +830,27 @@ class SineRowPlayer:
         empty_reads = 0
         last_stats_time = time.perf_counter()
         total_frames_read = 0
-        
+        selector = None
+        selector_pcm = None
+        woke_ready = False
+
         while self.bt_read_running:
             try:
                 if not self.bt_input or not self.bt_enabled:
                     time.sleep(0.1)
                     consecutive_errors = 0
                     continue
-                
-                # Aggressive read loop - read multiple times per iteration
+
+                # (Re)build the poll selector whenever the capture PCM changes
+                if self.bt_input is not selector_pcm:
+                    if selector is not None:
+                        selector.close()
+                    selector_pcm = self.bt_input
+                    selector = self._bt_make_selector(selector_pcm)
+
+                # Drain everything the PCM has buffered
                 frames_read_this_iteration = 0
-                for _ in range(10):  # Try up to 10 reads per loop
+                while True:
                     try:
                         length, data = self.bt_input.read()
                         
@@ -625,25 +860,15 @@ class SineRowPlayer:
                         if length > 0 and data:
                             consecutive_errors = 0
                             empty_reads = 0
-                            samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32767.0
-                            
+                            samples = np.frombuffer(data, dtype=np.int16)
+
                             if samples.size >= 2:
                                 stereo = samples.reshape(-1, 2)
                                 total_frames_read += len(stereo)
                                 frames_read_this_iteration += len(stereo)
-                                
+
                                 # Write to ring buffer
-                                with self.bt_ring_lock:
-                                    for frame in stereo:
-                                        if self.bt_ring_fill < self.bt_ring_buffer.shape[0]:
-                                            self.bt_ring_buffer[self.bt_ring_write_pos] = frame
-                                            self.bt_ring_write_pos = (self.bt_ring_write_pos + 1) % self.bt_ring_buffer.shape[0]
-                                            self.bt_ring_fill += 1
-                                        else:
-                                            # Buffer full, skip oldest sample
-                                            self.bt_ring_read_pos = (self.bt_ring_read_pos + 1) % self.bt_ring_buffer.shape[0]
-                                            self.bt_ring_buffer[self.bt_ring_write_pos] = frame
-                                            self.bt_ring_write_pos = (self.bt_ring_write_pos + 1) % self.bt_ring_buffer.shape[0]
+                                self._bt_push(stereo)
                         else:
                             # No more data available right now
                             break
@@ -654,14 +879,19 @@ class SineRowPlayer:
                 # Stats every 4 seconds
                 now = time.perf_counter()
                 if now - last_stats_time >= 4.0:
-                    with self.bt_ring_lock:
-                        fill_pct = (self.bt_ring_fill / self.bt_ring_buffer.shape[0]) * 100
-                    print(f"[BT] Buffer: {fill_pct:.1f}% full ({self.bt_ring_fill}/{self.bt_ring_buffer.shape[0]}), read {total_frames_read} frames in 4s")
+                    fill = min(self.bt_ring_write_pos - self.bt_ring_read_pos, BT_RING_FRAMES)
+                    fill_pct = (fill / BT_RING_FRAMES) * 100
+                    print(f"[BT] Buffer: {fill_pct:.1f}% full ({fill}/{BT_RING_FRAMES}), read {total_frames_read} frames in 4s")
                     last_stats_time = now
                     total_frames_read = 0
                 
-                # Short sleep to prevent tight loop
-                time.sleep(0.005)  # 5ms sleep
+                # Wait for ALSA to signal capture data. Fall back to a short sleep
+                # without poll support, or when readiness produced no frames
+                if selector is None or (woke_ready and frames_read_this_iteration == 0):
+                    time.sleep(0.005)  # 5ms sleep
+                    woke_ready = False
+                else:
+                    woke_ready = bool(selector.select(timeout=0.02))
                     
             except Exception as e:
                 consecutive_errors += 1
@@ -681,125 +911,178 @@ class SineRowPlayer:
                 elif consecutive_errors % 10 == 0:
                     print(f"[BT] Read error ({consecutive_errors}): {e}")
                 time.sleep(0.01)
-        
+
+        if selector is not None:
+            selector.close()
         print("[BT] Read thread stopped")
 
+    def _bt_make_selector(self, pcm):
+        """Selector over the capture PCM's poll descriptors; None falls back to sleep polling"""
+        try:
+            sel = selectors.DefaultSelector()
+            for fd, mask in pcm.polldescriptors():
+                events = 0
+                if mask & select.POLLIN:
+                    events |= selectors.EVENT_READ
+                if mask & select.POLLOUT:
+                    events |= selectors.EVENT_WRITE
+                sel.register(fd, events or selectors.EVENT_READ)
+            return sel
+        except Exception as e:
+            print(f"[BT] Poll descriptors unavailable ({e}), using timed polling")
+            return None
+
+    def _bt_push(self, stereo):
+        """Producer side: batch-write int16 stereo frames, then publish the new write
+        position. Overwrites the oldest frames on overflow; the reader skips past them"""
+        n = len(stereo)
+        if n > BT_RING_FRAMES:
+            # Only the newest BT_RING_FRAMES frames survive
+            stereo = stereo[-BT_RING_FRAMES:]
+        count = len(stereo)
+        w = self.bt_ring_write_pos
+        start = (w + n - count) & BT_RING_MASK
+        first = min(count, BT_RING_FRAMES - start)
+        self.bt_ring_buffer[start:start + first] = stereo[:first]
+        self.bt_ring_buffer[:count - first] = stereo[first:]
+        self.bt_ring_write_pos = w + n
+
     def _read_bt_from_ring(self, frames):
-        """Read audio from ring buffer - OPTIMIZED batch read"""
-        output = np.zeros((frames, 2), dtype=np.float32)
+        """Read audio from ring buffer - OPTIMIZED batch read into reused blocks"""
+        output = self._bt_i16[:frames]
         
-        with self.bt_ring_lock:
-            available = self.bt_ring_fill
-            to_read = min(frames, available)
-            
-            # Log underruns
-            if to_read < frames:
-                if not hasattr(self, '_underrun_count'):
-                    self._underrun_count = 0
-                    self._last_underrun_log = time.perf_counter()
-                self._underrun_count += 1
-                now = time.perf_counter()
-                if now - self._last_underrun_log >= 1.0:
-                    print(f"[BT] UNDERRUN: requested {frames}, only had {available} (count: {self._underrun_count})")
-                    self._last_underrun_log = now
-                    self._underrun_count = 0
-            
-            # Batch read - much faster than frame-by-frame
-            if to_read > 0:
-                space_until_wrap = self.bt_ring_buffer.shape[0] - self.bt_ring_read_pos
-                
-                if to_read <= space_until_wrap:
-                    # Can read all without wrapping
-                    output[:to_read] = self.bt_ring_buffer[self.bt_ring_read_pos:self.bt_ring_read_pos + to_read]
-                    self.bt_ring_read_pos = (self.bt_ring_read_pos + to_read) % self.bt_ring_buffer.shape[0]
-                else:
-                    # Need to wrap around
-                    output[:space_until_wrap] = self.bt_ring_buffer[self.bt_ring_read_pos:]
-                    remaining = to_read - space_until_wrap
-                    output[space_until_wrap:to_read] = self.bt_ring_buffer[:remaining]
-                    self.bt_ring_read_pos = remaining
-                
-                self.bt_ring_fill -= to_read
-        
-        return output
+        w = self.bt_ring_write_pos
+        r = self.bt_ring_read_pos
+        if self._bt_ring_discard:
+            self._bt_ring_discard = False
+            r = w
+        elif w - r > BT_RING_FRAMES:
+            # Writer lapped the reader: buffer full, oldest samples were skipped
+            r = w - BT_RING_FRAMES
+        available = w - r
+        to_read = min(frames, available)
+
+        # Log underruns
+        if to_read < frames:
+            self._underrun_count += 1
+            now = time.perf_counter()
+            if now - self._last_underrun_log >= 1.0:
+                print(f"[BT] UNDERRUN: requested {frames}, only had {available} (count: {self._underrun_count})")
+                self._last_underrun_log = now
+                self._underrun_count = 0
+
+        # Batch read - much faster than frame-by-frame (second slice covers the wrap)
+        if to_read > 0:
+            start = r & BT_RING_MASK
+            first = min(to_read, BT_RING_FRAMES - start)
+            output[:first] = self.bt_ring_buffer[start:start + first]
+            output[first:to_read] = self.bt_ring_buffer[:to_read - first]
+        output[to_read:] = 0  # Underrun tail is silence
+
+        # Publish the new read position only after the copy
+        self.bt_ring_read_pos = r + to_read
+
+        return np.divide(output, 32767.0, out=self._bt_stereo[:frames], dtype=np.float32)
 
     def _read_media_from_ring(self, frames):
-        """Read frames from media engine ring buffer (stereo PCM)"""
-        output = np.zeros((frames, 2), dtype=np.float32)
+        """Read frames from media engine ring buffer (stereo PCM) into a reused block"""
+        output = self._media_stereo[:frames]
 
         if not self.media_engine or not self.media_engine.pipeline:
+            output.fill(0.0)
             return output
 
         try:
+            samples = self._media_i16[:frames]
             with self.media_ring_lock:
                 frames_available = len(self.media_ring)
-                frames_to_read = min(frames, frames_available)
-
-                if frames_to_read > 0:
-                    print(f"[MEDIA-READ] Available: {frames_available}, reading {frames_to_read}")
-                    # Pop frames from the deque and convert to numpy
-                    for i in range(frames_to_read):
-                        frame_bytes = self.media_ring.popleft()
-                        # Frame is 4 bytes (2 channels × 2 bytes S16)
-                        if len(frame_bytes) >= 4:
-                            samples = np.frombuffer(frame_bytes, dtype=np.int16)
-                            output[i, :] = samples / 32767.0
+                # One slice copy (two across the wrap) out of the ring
+                written = self.media_ring.read_into(samples)
 
-            return output
+            if written and AUDIO_DEBUG:
+                print(f"[MEDIA-READ] Available: {frames_available}, reading {written}")
+
+            # Conversion happens outside the lock the GStreamer thread also takes.
+            # Underrun tail is silence in both the S16 (headset) and float blocks
+            samples[written:] = 0
+            # S16 -> float32 straight into the block, no float64 temporary
+            return np.divide(samples, 32767.0, out=output, dtype=np.float32)
         except Exception as e:
             print(f"[MEDIA] Error reading from ring: {e}")
+            output.fill(0.0)
             return output
 
-    def _bt_to_8ch(self, bt_stereo_block):
-        """200Hz lowpass then mono/stereo to 8ch - scipy or simple FIR fallback"""
+    def _init_bt_lpf(self):
+        """Build the BT 200Hz lowpass and its state once, for whichever filter is in use.
+
+        The filter works channel-major (planar): the interleaved (frames, 2) block is
+        split once into (2, frames) rows, so each channel is filtered and downmixed
+        on unit-stride memory, and only the final 8ch spread writes interleaved"""
+        self._bt_planar_out = np.empty((2, BLOCK), dtype=np.float32)
+        if SCIPY_AVAILABLE:
+            self._bt_lpf_sos = scipy_signal.butter(4, self.bt_lpf_fc, 'low', fs=RATE, output='sos')
+            # State laid out (sections, channels, 2) so both planar rows filter in one call
+            zi = scipy_signal.sosfilt_zi(self._bt_lpf_sos)
+            self._bt_lpf_zi = np.repeat(zi[:, None, :], 2, axis=1)
+            self._bt_planar_in = np.empty((2, BLOCK), dtype=np.float64)
+        else:
+            # Columns 0..3 hold the previous block's last 4 samples, the new block follows
+            self._fir_hist = np.zeros((2, BLOCK + 4), dtype=np.float32)
+            self._fir_tmp = np.empty((2, BLOCK), dtype=np.float32)
+
+    def _bt_to_8ch(self, bt_stereo_block, gain, out):
+        """200Hz lowpass then mono/stereo to 8ch - scipy or simple FIR fallback. The gain
+        is applied to the 1-2 filtered rows and the result is added straight into `out`,
+        so no 8ch BT block is ever materialized"""
         frames = bt_stereo_block.shape[0]
         
+        # Planar (2, frames) result: row 0 = left, row 1 = right
+        bt_filtered = self._bt_planar_out[:, :frames]
         if SCIPY_AVAILABLE:
-            # Fast scipy Butterworth filter
-            if self._bt_lpf_sos is None:
-                self._bt_lpf_sos = scipy_signal.butter(4, self.bt_lpf_fc, 'low', fs=RATE, output='sos')
-                self._bt_lpf_zi = scipy_signal.sosfilt_zi(self._bt_lpf_sos)
-                self._bt_lpf_zi = np.stack([self._bt_lpf_zi, self._bt_lpf_zi])
-            
-            bt_filtered = np.empty_like(bt_stereo_block)
-            for ch in range(2):
-                bt_filtered[:, ch], self._bt_lpf_zi[ch] = scipy_signal.sosfilt(
-                    self._bt_lpf_sos, 
-                    bt_stereo_block[:, ch],
-                    zi=self._bt_lpf_zi[ch]
-                )
+            # Fast scipy Butterworth filter, run along contiguous channel rows
+            planar = self._bt_planar_in[:, :frames]
+            np.copyto(planar, bt_stereo_block.T)
+            y, self._bt_lpf_zi = scipy_signal.sosfilt(
+                self._bt_lpf_sos,
+                planar,
+                axis=-1,
+                zi=self._bt_lpf_zi
+            )
+            # Silence (BT off, underruns) decays the IIR state toward zero and, left alone,
+            # into subnormal floats that filter ~20x slower: snap it to zero well before
+            np.copyto(self._bt_lpf_zi, 0.0, where=np.abs(self._bt_lpf_zi) < 1e-20)
+            np.copyto(bt_filtered, y, casting='same_kind')
         else:
             # Simple 5-tap FIR lowpass (fast, reasonable quality)
             # Approximates 200Hz cutoff at 48kHz
-            if not hasattr(self, '_fir_buffer'):
-                self._fir_buffer = np.zeros((2, 4), dtype=np.float32)
-            
-            bt_filtered = np.empty_like(bt_stereo_block)
-            # Simple moving average-ish coefficients
-            h = np.array([0.1, 0.2, 0.4, 0.2, 0.1], dtype=np.float32)
-            
-            for ch in range(2):
-                signal_in = bt_stereo_block[:, ch]
-                signal_out = np.zeros(frames, dtype=np.float32)
-                
-                # Use numpy convolve for speed
-                padded = np.concatenate([self._fir_buffer[ch], signal_in])
-                filtered = np.convolve(padded, h, mode='valid')
-                signal_out = filtered[:frames]
-                
-                # Save last 4 samples for next block
-                self._fir_buffer[ch] = signal_in[-4:]
-                bt_filtered[:, ch] = signal_out
-        
-        out = np.zeros((frames, CHANNELS), dtype=np.float32)
+            hist = self._fir_hist
+            hist[:, 4:4 + frames] = bt_stereo_block.T
+
+            # Simple moving average-ish coefficients [0.1, 0.2, 0.4, 0.2, 0.1]: symmetric,
+            # so both channels filter as three shifted-slice multiply-adds
+            tmp = self._fir_tmp[:, :frames]
+            np.add(hist[:, 0:frames], hist[:, 4:frames + 4], out=bt_filtered)
+            bt_filtered *= 0.1
+            np.add(hist[:, 1:frames + 1], hist[:, 3:frames + 3], out=tmp)
+            tmp *= 0.2
+            bt_filtered += tmp
+            np.multiply(hist[:, 2:frames + 2], 0.4, out=tmp)
+            bt_filtered += tmp
+
+            # Save last 4 samples for next block
+            hist[:, :4] = hist[:, frames:frames + 4]
         
         if self.bt_mono:
-            mono = (bt_filtered[:, 0] + bt_filtered[:, 1]) * 0.5
-            out[:] = mono[:, np.newaxis]
+            # All 8 channels carry the same signal: broadcast the one mono column
+            mono = np.add(bt_filtered[0], bt_filtered[1], out=self._bt_mono[:frames])
+            mono *= 0.5
+            mono *= gain
+            out += mono[:, np.newaxis]
         else:
-            out[:, 0::2] = bt_filtered[:, 0:1]
-            out[:, 1::2] = bt_filtered[:, 1:2]
-        
+            # Back to interleaved only here: L onto the even columns, R onto the odd
+            bt_filtered *= gain
+            out[:, 0::2] += bt_filtered[0][:, np.newaxis]
+            out[:, 1::2] += bt_filtered[1][:, np.newaxis]
         return out
 
     def is_device_available(self) -> bool:
@@ -844,17 +1127,14 @@ class SineRowPlayer:
                 channels=2,
                 rate=RATE,
                 format=alsaaudio.PCM_FORMAT_S16_LE,
-                periodsize=BLOCK
+                periodsize=BT_CAPTURE_PERIOD
             )
             self.bt_input = cap
             self.bt_mac_current = bt_mac
             self.bt_enabled = True
             
-            # Clear ring buffer
-            with self.bt_ring_lock:
-                self.bt_ring_write_pos = 0
-                self.bt_ring_read_pos = 0
-                self.bt_ring_fill = 0
+            # Clear ring buffer (the reader drops what is buffered)
+            self._bt_ring_discard = True
             
             # Start read thread
             self.bt_read_running = True
@@ -878,16 +1158,13 @@ class SineRowPlayer:
                 channels=2,
                 rate=RATE,
                 format=alsaaudio.PCM_FORMAT_S16_LE,
-                periodsize=BLOCK
+                periodsize=BT_CAPTURE_PERIOD
             )
             self.bt_input = cap
             self.bt_mac_current = bt_mac
             self.bt_enabled = True
-            # Clear ring buffer
-            with self.bt_ring_lock:
-                self.bt_ring_write_pos = 0
-                self.bt_ring_read_pos = 0
-                self.bt_ring_fill = 0
+            # Clear ring buffer (the reader drops what is buffered)
+            self._bt_ring_discard = True
             # Start read thread
             self.bt_read_running = True
             self.bt_read_thread = threading.Thread(target=self._bt_read_loop, daemon=True)
@@ -901,21 +1178,24 @@ class SineRowPlayer:
             return False
 
     def ensure_stream(self):
+        # Hotplug re-checks run in the executor while play requests call this on the
+        # event loop: serialize them so aplay and the audio loop are started only once
+        with self._stream_lock:
+            return self._ensure_stream_locked()
+
+    def _ensure_stream_locked(self):
         try:
             if not self._init_alsa_output():
                 print("[!] Failed to initialize ALSA output")
                 return False
 
             # Check if audio loop is already running
-            if getattr(self, '_audio_running', False):
+            if self._audio_running:
                 # Audio loop already running
                 # Check if BT thread needs restart (after stop was called)
                 if self.bt_enabled and self.bt_input and not self.bt_read_running:
                     print("[BT] Restarting read thread")
-                    with self.bt_ring_lock:
-                        self.bt_ring_write_pos = 0
-                        self.bt_ring_read_pos = 0
-                        self.bt_ring_fill = 0
+                    self._bt_ring_discard = True
                     self.bt_read_running = True
                     self.bt_read_thread = threading.Thread(target=self._bt_read_loop, daemon=True)
                     self.bt_read_thread.start()
@@ -942,7 +1222,8 @@ class SineRowPlayer:
         self.is_playing_sequence = False
         self.sequence_rows = None
         self.row = row
-        self.row_start_time = time.perf_counter()
+        self._cache_row()
+        self.row_samples = 0
         self.phase_accum = 0.0
         self.mod_phase_accum = 0.0
         self.last_inst_f = float(row.get("frequency", 20.0))
@@ -967,7 +1248,8 @@ class SineRowPlayer:
             return
         self.current_row_index = index
         self.row = self.sequence_rows[index]
-        self.row_start_time = time.perf_counter()
+        self._cache_row()
+        self.row_samples = 0
         self.phase_accum = 0.0
         self.mod_phase_accum = 0.0
         self.last_inst_f = float(self.row.get("frequency", 20.0))
@@ -994,15 +1276,15 @@ class SineRowPlayer:
             except BrokenPipeError:
                 break
     
-    def _write_headset(self, data_bytes: bytes):
-        """Write stereo PCM bytes to Bluetooth headset"""
+    def _write_headset(self, data_bytes):
+        """Write stereo PCM (bytes or int16 block) to Bluetooth headset"""
         if not self.headset_enabled:
             return
         if not self.headset_process:
             return
         if self.headset_process.poll() is not None:
             return
-        mv = memoryview(data_bytes)
+        mv = memoryview(data_bytes).cast('B')
         total = len(mv)
         off = 0
         writes_done = 0
@@ -1018,10 +1300,12 @@ class SineRowPlayer:
                 self.headset_process = None
                 break
             
-    def _write_all(self, data_bytes: bytes):
-            if not hasattr(self, "_alsa_process") or self._alsa_process is None:
+    def _write_all(self, data_bytes):
+            # Accepts bytes or any C-contiguous buffer (e.g. the int16 PCM block) -
+            # written through a byte view, so no copy is made
+            if self._alsa_process is None:
                 return
-            mv = memoryview(data_bytes)
+            mv = memoryview(data_bytes).cast('B')
             total = len(mv)
             off = 0
             while off < total:
@@ -1067,146 +1351,285 @@ class SineRowPlayer:
         print(f"[FADE] Starting fade-out ({FADE_TIME}s)")
 
     def _apply_fade(self, signal, frames):
-        """Apply fade envelope to signal - OPTIMIZED vectorized version without gaps"""
-        if self.fade_direction == 0 and self.fade_samples_remaining <= 0:
-            return signal
-        
-        fade_envelope = np.ones(frames, dtype=np.float32)
-        
-        if self.fade_samples_remaining > 0:
-            samples_to_process = min(frames, self.fade_samples_remaining)
-            
-            # Calculate the starting progress for this block
+        """Apply fade envelope to signal in place - a vectorized ramp over the samples still
+        fading, a plain scalar gain everywhere else"""
+        if self.fade_samples_remaining <= 0:
+            # No ramp left: full level passes through untouched (no envelope pass),
+            # a completed fade-out stays silent until the row actually ends
+            return self._apply_fade_level(signal, self.fade_multiplier)
+
+        samples_to_process = min(frames, self.fade_samples_remaining)
+        progress_array = self._fade_env[:samples_to_process]
+
+        # Calculate the starting progress for this block
+        if self.fade_direction == 1:
+            # Fade in: progress from current position
+            start_progress = (FADE_SAMPLES - self.fade_samples_remaining) / FADE_SAMPLES
+            np.add(start_progress, self._fade_ramp[:samples_to_process], out=progress_array)
+            self.fade_multiplier = float(progress_array[-1])
+
+        elif self.fade_direction == -1:
+            # Fade out: progress from current position
+            start_progress = self.fade_samples_remaining / FADE_SAMPLES
+            np.subtract(start_progress, self._fade_ramp[:samples_to_process], out=progress_array)
+            np.maximum(progress_array, 0.0, out=progress_array)
+            self.fade_multiplier = float(progress_array[-1])
+
+        else:
+            progress_array.fill(1.0)
+
+        self.fade_samples_remaining -= samples_to_process
+
+        # Handle completion of fade
+        if self.fade_samples_remaining <= 0:
             if self.fade_direction == 1:
-                # Fade in: progress from current position
-                start_progress = (FADE_SAMPLES - self.fade_samples_remaining) / FADE_SAMPLES
-                # Vectorized calculation of fade envelope
-                progress_array = start_progress + np.arange(samples_to_process, dtype=np.float32) / FADE_SAMPLES
-                fade_envelope[:samples_to_process] = progress_array
-                self.fade_multiplier = progress_array[-1]
-                
+                self.fade_multiplier = 1.0
             elif self.fade_direction == -1:
-                # Fade out: progress from current position
-                start_progress = self.fade_samples_remaining / FADE_SAMPLES
-                # Vectorized calculation of fade envelope
-                progress_array = start_progress - np.arange(samples_to_process, dtype=np.float32) / FADE_SAMPLES
-                fade_envelope[:samples_to_process] = np.maximum(0.0, progress_array)
-                self.fade_multiplier = max(0.0, progress_array[-1])
-            
-            self.fade_samples_remaining -= samples_to_process
-            
-            # Handle completion of fade
-            if self.fade_samples_remaining <= 0:
-                if self.fade_direction == 1:
-                    self.fade_multiplier = 1.0
-                elif self.fade_direction == -1:
-                    self.fade_multiplier = 0.0
-                self.fade_direction = 0
-            
-            # Fill remaining samples with final multiplier value
-            if samples_to_process < frames:
-                fade_envelope[samples_to_process:] = self.fade_multiplier
-        else:
-            # No active fade, use constant multiplier
-            fade_envelope[:] = self.fade_multiplier
-        
-        # Apply envelope
-        if signal.ndim == 2:
-            return signal * fade_envelope[:, None]
+                self.fade_multiplier = 0.0
+            self.fade_direction = 0
+
+        # Ramp over the fading samples, then the final level over the rest of the block
+        head = signal[:samples_to_process]
+        if head.ndim == 2:
+            head *= progress_array[:, None]
         else:
-            return signal * fade_envelope
+            head *= progress_array
+        if samples_to_process < frames:
+            self._apply_fade_level(signal[samples_to_process:], self.fade_multiplier)
+        return signal
+
+    @staticmethod
+    def _apply_fade_level(signal, level):
+        """Scale signal in place by a constant fade level"""
+        if level >= 1.0:
+            return signal
+        if level <= 0.0:
+            signal.fill(0.0)
+            return signal
+        signal *= level
+        return signal
             
-    def _generate_4_channel_audio(self, f0, fsweep, sspd, t0, tt_block, frames):
-        """Generate 4-channel carrier audio WITHOUT phase offsets (all in-phase)"""
+    def _generate_carrier(self, f0, fsweep, sspd, t0, frames):
+        """Generate the carrier shared by all 4 outputs (in-phase), shape (frames,).
+
+        Per-sample work runs in float32: phases stay small (the block start is wrapped
+        into [0, 2pi) as a float64 scalar first), which float32 resolves to well under
+        a milliradian at these <=200Hz frequencies"""
         dt = 1.0 / RATE
         if fsweep and sspd:
-            lfo = np.sin(2*np.pi*sspd*(t0 + tt_block))
-            inst_f = f0 + fsweep * lfo
-            inst_f = np.clip(inst_f, 20, 200)
-        else:
-            inst_f = np.full_like(tt_block, f0)
-        
-        audio_outputs = np.zeros((frames, 4), dtype=np.float32)
-        
-        # Generate phase for first channel
-        if isinstance(inst_f, np.ndarray):
-            phase_increments = 2 * np.pi * inst_f * dt
-            phi = self.phase_accum + np.cumsum(phase_increments)
+            # Swept frequency: integrate the per-sample increments. Every stage
+            # (lfo -> inst_f -> increments -> phi) runs in place in one scratch buffer.
+            # The sweep LFO starts from its wrapped block-start phase, not absolute row time
+            w_lfo = 2*np.pi*sspd
+            phi = np.multiply(self._k_block[:frames], w_lfo * dt, out=self._phi_buf[:frames])
+            phi += (w_lfo * t0) % (2*np.pi)
+            np.sin(phi, out=phi)               # lfo
+            phi *= fsweep
+            phi += f0
+            np.clip(phi, 20, 200, out=phi)     # inst_f
+            phi *= 2 * np.pi * dt              # phase increments
+            np.cumsum(phi, out=phi)
+            phi += self.phase_accum
+            carrier = np.sin(phi, out=self._carrier[:frames])
+            # The last cumulative phase is exactly where the next block continues
+            self.phase_accum = float(phi[-1])
         else:
-            phase_increment = 2 * np.pi * inst_f * dt
-            phi = self.phase_accum + np.arange(frames) * phase_increment
-        
-        carrier = np.sin(phi).astype(np.float32)
-        
-        # All 4 channels get the SAME carrier signal (in-phase)
-        for output_idx in range(4):
-            audio_outputs[:, output_idx] = carrier
-        
-        # Update phase accumulator
-        if isinstance(inst_f, np.ndarray):
-            phase_increments = 2 * np.pi * inst_f * dt
-            self.phase_accum += np.sum(phase_increments)
-        else:
-            self.phase_accum += frames * 2 * np.pi * inst_f * dt
+            # Constant frequency: sin(phi0 + k*inc) = sin(phi0)*cos(k*inc) + cos(phi0)*sin(k*inc).
+            # The k*inc basis only changes with the frequency, so each block costs two
+            # scalar trig calls and a multiply-add instead of a per-sample sin
+            phase_increment = 2 * np.pi * f0 * dt
+            cos_k, sin_k = self._carrier_basis(phase_increment)
+            a = np.multiply(cos_k[:frames], math.sin(self.phase_accum), out=self._phi_buf[:frames])
+            b = np.multiply(sin_k[:frames], math.cos(self.phase_accum), out=self._phi_tmp[:frames])
+            carrier = np.add(a, b, out=self._carrier[:frames])
+            self.phase_accum += frames * phase_increment
+
         self.phase_accum %= 2*np.pi
-        
-        return audio_outputs
-
-    def _route_audio_to_speakers(self, audio_outputs, mode):
-        if mode not in MODE_ROUTING:
-            mode = 0
-        routing = MODE_ROUTING[mode]
-        speaker_outputs = np.zeros((audio_outputs.shape[0], CHANNELS), dtype=np.float32)
-        for output_idx, speaker_list in routing.items():
-            if output_idx < audio_outputs.shape[1]:
-                for speaker_idx in speaker_list:
-                    if 0 <= speaker_idx < CHANNELS:
-                        speaker_outputs[:, speaker_idx] = audio_outputs[:, output_idx]
-        return speaker_outputs
+
+        return carrier
+
+    def _cache_row(self):
+        """Resolve the current row's parameters once, so the audio loop reads plain
+        attributes instead of doing dict lookups and coercions every block"""
+        row = self.row
+        self._row_f0 = min(float(row.get("frequency", 20.0)), 150.0)  # Limit to 150Hz max
+        self._row_fsweep = float(row.get("freqSweep", 0))
+        self._row_sspd = float(row.get("sweepSpeed", 0))
+        self._row_dur = float(row.get("time", 60))
+        self._row_mode = int(row.get("mode", 0))
+        # Rows too short for a fade-out never start one
+        self._row_fade_start = self._row_dur - FADE_TIME if self._row_dur > FADE_TIME else math.inf
+        self._row_route = MODE_MATRICES.get(self._row_mode, MODE_MATRICES[0])
+        self._row_strength = int(row.get("strength", 5))
+        self._row_trims = {col: int(row.get(col, 5)) for col in CHANNEL_MAP}
+        self._mod_fn = self._build_mod_fn(row)
+        self._gains_dirty = True
+
+    def _build_mod_fn(self, row):
+        """Build the modulation stage for a row with its constants captured up front,
+        so the audio loop makes one call per block instead of re-deriving them"""
+        phase = float(row.get("phase", 90))  # This now controls MODULATION phase
+        mod_val = float(row.get("modSpeed", 5))
+
+        # Logarithmic mapping: slider 1-100 ? 0.03-10 Hz
+        f_min, f_max, N = 0.03, 10.0, 100
+        mod_freq = f_min * (f_max / f_min) ** ((mod_val - 1) / (N - 1))
+
+        if not mod_freq > 0:
+            def passthrough(carrier, frames):
+                # Read-only (frames, 4) view of the carrier, no copies
+                return np.broadcast_to(carrier[:, None], (frames, 4))
+            return passthrough
+
+        w_dt = 2 * np.pi * mod_freq * (1.0 / RATE)
+        phase_offsets = np.deg2rad(phase * np.arange(4))
+        # The LFO frequency is fixed for the row, so like the carrier it expands by angle
+        # addition: sin(p_j + k*w_dt) = sin(p_j)*cos(k*w_dt) + cos(p_j)*sin(k*w_dt), with
+        # p_j = phi0 + offset_j. The (BLOCK, 2) cos/sin basis is built here once, angles
+        # in float64 and stored float32 like the carrier it multiplies (the phases in p
+        # stay float64, only the [-1, 1] results are narrowed)
+        k_w = np.arange(BLOCK, dtype=np.float64) * w_dt
+        basis = np.column_stack((np.cos(k_w), np.sin(k_w))).astype(np.float32)
+        coef = np.empty((2, 4), dtype=np.float32)
+        p = np.empty(4, dtype=np.float64)  # Per-output LFO phases at the block start
+        mod_env = self._mod_env
+
+        def sine_mod(carrier, frames):
+            # Sine wave modulation with phase control: 8 scalar trig calls, then one
+            # (frames, 2) @ (2, 4) matmul gives all 4 phase-shifted LFOs; the 0.5 of
+            # (sin + 1) * 0.5 is folded into the coefficients
+            phi0 = self.mod_phase_accum
+            np.add(phase_offsets, phi0, out=p)
+            np.sin(p, out=coef[0])
+            np.cos(p, out=coef[1])
+            np.multiply(coef, 0.5, out=coef)
+            amp_env = np.matmul(basis[:frames], coef, out=mod_env[:frames])
+            amp_env += 0.5
+            self.mod_phase_accum = (phi0 + w_dt * frames) % (2*np.pi)
+            return np.multiply(carrier[:, None], amp_env, out=amp_env)
+        return sine_mod
+
+    def _carrier_basis(self, phase_increment):
+        """cos/sin of k*phase_increment for k = 1..BLOCK, rebuilt only when the frequency changes"""
+        if phase_increment != self._carrier_inc:
+            k_inc = np.arange(1, BLOCK + 1, dtype=np.float64) * phase_increment
+            # Angles in float64, stored float32 like the scratch they are multiplied into
+            self._carrier_cos = np.cos(k_inc).astype(np.float32)
+            self._carrier_sin = np.sin(k_inc).astype(np.float32)
+            self._carrier_inc = phase_increment
+        return self._carrier_cos, self._carrier_sin
+
+    def _rebuild_route_gains(self, therapy_mix_gain):
+        """Resolve the per-speaker gains from the row's strength/trims and the user controls,
+        and fold them with therapy_gain and the S16 scale into the row's routing matrix. Runs
+        only when one of those changed, not every block"""
+        self._gains_dirty = False  # Cleared first: a control set meanwhile marks it again
+        self._gains_therapy_mix = therapy_mix_gain
+        user_master = getattr(self, "user_strength", None)
+        final_master = apply_dual_strength(self._row_strength, 
+                                            int(user_master) if user_master is not None else None)
+
+        col_trims = []
+        for col in CHANNEL_MAP:
+            matrix_trim = self._row_trims[col]
+            user_trim = getattr(self, f"user_{col}", None)
+            final_trim = apply_dual_strength(matrix_trim, 
+                                              int(user_trim) if user_trim is not None else None)
+            col_trims.append(final_trim)
+        # apply_dual_strength keeps both steps in 0..9, so they index the
+        # gain table directly: 4 column gains, then expanded to the speakers
+        self._base_gains = _AMP_TABLE[final_master, col_trims][CHANNEL_COL_IDX]
+        self._row_effective = self._row_route * (self._base_gains * (therapy_mix_gain * PCM_SCALE))[None, :]
+
+    @staticmethod
+    def _route_audio_to_speakers(audio_outputs, effective, out):
+        """Route the 4 outputs to the speakers with their gains applied as one
+        (frames, 4) @ (4, CHANNELS) matmul written straight into `out`. `effective` is
+        the row's routing matrix with the gains folded in (see _rebuild_route_gains)"""
+        return np.matmul(audio_outputs, effective, out=out)
+
+    def _pcm_writer_loop(self, stop, pcm_free, pcm_filled, pcm_slots, headset_slots):
+        """Drain filled PCM ring slots to aplay (chair DAC, then headset) so pipe
+        writes never stall block generation. The stop event and ring belong to one
+        audio loop run and are passed in, so this never touches a later run's ring"""
+        tail = 0
+        while not stop.is_set():
+            if not pcm_filled.acquire(timeout=0.5):
+                continue
+            slot = tail & PCM_RING_MASK
+            self._write_all(pcm_slots[slot])
+            self._write_headset(headset_slots[slot])  # Send to BT headset only
+            tail += 1
+            pcm_free.release()
 
     def _pure_audio_loop(self):
-        """Improved audio loop with precise timing"""
+        """Audio generation loop, paced by backpressure from the aplay pipe"""
         frames_per_callback = BLOCK
         expected_duration = frames_per_callback / RATE
-        next_callback_time = time.perf_counter()
-        
+
+        # The previous run's writer must be gone before this run's starts: it may still
+        # be finishing a pipe write and would otherwise share the slot buffers
+        previous = self._pcm_writer
+        if previous is not None and previous.is_alive():
+            print("[AUDIO] Waiting for the previous PCM writer to exit")
+            previous.join()
+
+        # Fresh ring and stop event for this run, handed to its writer thread.
+        # Loop invariants are bound once, so each block skips the attribute lookups
+        generate = self._generate_therapy_audio
+        stop = threading.Event()
+        pcm_free = threading.Semaphore(PCM_RING_SLOTS)
+        pcm_filled = threading.Semaphore(0)
+        pcm_slots = self._pcm_slots
+        headset_slots = self._headset_slots
+        head = 0
+        writer = threading.Thread(target=self._pcm_writer_loop,
+                                  args=(stop, pcm_free, pcm_filled, pcm_slots, headset_slots),
+                                  daemon=True)
+        self._pcm_writer = writer
+        writer.start()
+
         print("[AUDIO] Audio loop started")
-        
-        while getattr(self, '_audio_running', False):
+
+        while self._audio_running:
             try:
-                mixed_signal = self._generate_therapy_audio(frames_per_callback)
-                
-                if mixed_signal is not None and hasattr(self, '_alsa_process') and self._alsa_process:
-                    if self._alsa_process.poll() is None:
-                        int16_data = np.clip(mixed_signal, -1.0, 1.0)
-                        int16_data = (int16_data * 32767.0).astype(np.int16, copy=False)
-                        bytes_to_write = int16_data.tobytes()
-                        self._write_all(bytes_to_write)
-
-                        # --- Loopback writer DISABLED (bridge owns Loopback,0 now) ---
-                        # Headset feed gets ONLY Bluetooth music, bypassing 200Hz lowpass filter
-                        if hasattr(self, '_bt_stereo_unfiltered') and self._bt_stereo_unfiltered is not None:
-                            # Send full-bandwidth BT audio to headphones
-                            stereo = self._bt_stereo_unfiltered
-                            st_i16 = (np.clip(stereo, -1.0, 1.0) * 32767.0).astype(np.int16, copy=False)
-                            headset_bytes = st_i16.tobytes()
-                            self._write_headset(headset_bytes)  # Send to BT headset only
-                        else:
-                            # No BT audio - send silence to headset
-                            silence = np.zeros((frames_per_callback, 2), dtype=np.int16)
-                            self._write_headset(silence.tobytes())  # Send to BT headset only
-                    else:
+                has_output = self._alsa_process is not None
+                if has_output:
+                    if self._alsa_process.poll() is not None:
                         break
-                
-                # Precise timing to maintain consistent sample rate
-                next_callback_time += expected_duration
-                sleep_time = next_callback_time - time.perf_counter()
-                
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                    # Claim a free slot BEFORE generating: slots only free up as the writer's
+                    # blocking pipe writes drain into aplay, so this is what paces the loop
+                    if not pcm_free.acquire(timeout=0.5):
+                        print("[AUDIO] PCM writer stalled")
+                        continue
+
+                mixed_signal = generate(frames_per_callback)
+
+                if not has_output:
+                    # No aplay to pace against - keep the block rate with a plain sleep
+                    time.sleep(expected_duration)
+                    continue
+
+                slot = head & PCM_RING_MASK
+
+                # Already scaled to S16 and saturated by the mixer - a single
+                # round-to-nearest pass straight into the slot, no scratch block
+                np.rint(mixed_signal, out=pcm_slots[slot], casting='unsafe')
+
+                # --- Loopback writer DISABLED (bridge owns Loopback,0 now) ---
+                # Headset feed gets ONLY Bluetooth music, bypassing 200Hz lowpass filter
+                st_i16 = headset_slots[slot]
+                src = self._headset_src
+                if src is not None:
+                    # Send full-bandwidth BT/media audio to headphones: the S16 frames
+                    # straight from their ring, one copy and no conversion
+                    np.copyto(st_i16, src)
                 else:
-                    # We're falling behind - reset timing
-                    next_callback_time = time.perf_counter()
+                    # No BT audio - send silence to headset
+                    st_i16.fill(0)
+
+                head += 1
+                pcm_filled.release()
                     
             except BrokenPipeError:
                 print("[AUDIO] Broken pipe - ALSA process terminated")
@@ -1217,6 +1640,9 @@ class SineRowPlayer:
 
         print("[AUDIO] Audio loop ended")
         self._audio_running = False
+        stop.set()
+        # Bounded wait here; the next run waits for this writer before starting its own
+        writer.join(timeout=1.0)
                 
     def _reset_state(self):
         self.phase_accum = 0.0
@@ -1226,14 +1652,20 @@ class SineRowPlayer:
         self.fade_samples_remaining = 0
         self.fade_direction = 0
         self.fade_multiplier = 0.0
-        self.row_start_time = 0.0
+        self.row_samples = 0
 
 # ---- WS Handler ----
 class WebSocketHandler:
     def __init__(self):
         self.clients=set(); self.player=SineRowPlayer(self)
-        self.highlight_queue=[]; self.clear_highlight_pending=False
+        self.highlight_queue=deque(); self.clear_highlight_pending=False  # Appended from the audio thread
+        self._message_queue=[]
+        self._outbox_event=None; self._outbox_loop=None  # Set by highlight_sender, see _wake_sender
         self.bt_task=None; self.bt_enabled=False; self.bt_mac_current=None
+        self._btctl_cache={}  # args -> (timestamp, (ok, out)) for read-only queries
+        self._alsa_pcms_cache=None  # (timestamp, pcms) from the last `aplay -L`
+        self._pending_bt_gain=None; self._mix_flush_task=None  # Debounced mix.json write
+        self._dbus_bus=None  # System bus, connected on first adapter query (False if unusable)
         cfg=load_config()
         try: self.player.bt_mono=bool(cfg.get("bt_mono",True)); print(f"[BT] Startup mode: {'MONO' if self.player.bt_mono else 'STEREO'}")
         except: pass
@@ -1245,9 +1677,15 @@ class WebSocketHandler:
         self._queue_message("resume:complete")
 
     def _queue_message(self, message):
-        if not hasattr(self, '_message_queue'):
-            self._message_queue = []
         self._message_queue.append(message)
+        self._wake_sender()
+
+    def _wake_sender(self):
+        """Wake highlight_sender to flush the queues - safe from any thread, since the
+        audio loop queues from its own"""
+        loop = self._outbox_loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._outbox_event.set)
 
     def send_treatment_state(self, state: dict):
         try:
@@ -1257,25 +1695,47 @@ class WebSocketHandler:
             print(f"[WS] Error queuing treatment-state: {e}")
         
     async def _process_queued_messages(self):
-        if not hasattr(self, '_message_queue') or not self._message_queue:
+        if not self._message_queue:
             return
         messages_to_send = self._message_queue.copy()
         self._message_queue.clear()
-        for message in messages_to_send:
-            await self._send_to_all_clients(message)
+        # One fan-out for the whole batch, order kept per client
+        await self._send_batch_to_all_clients(messages_to_send)
+
+    async def _send_to_all_clients(self, message, what="message"):
+        await self._send_batch_to_all_clients((message,), what)
 
-    async def _send_to_all_clients(self, message):
+    async def _send_batch_to_all_clients(self, messages, what="message"):
+        """Send messages, in order, to every client. websockets.broadcast encodes and frames
+        each message once and writes it to every open connection without awaiting any of
+        them, so one slow socket can't delay the rest; closed connections are skipped
+        (handle_client drops them from self.clients)"""
         if not self.clients:
             return
-        disconnected = set()
-        for client in self.clients:
+        # Nothing waits on a client's socket, so a frozen one would only grow its
+        # write buffer: past WS_CLIENT_BACKLOG_MAX it is cut off instead
+        for ws in [c for c in self.clients if c.transport.get_write_buffer_size() > WS_CLIENT_BACKLOG_MAX]:
+            print(f"[WS] Dropping stalled client {ws.remote_address}")
+            self.clients.discard(ws)
+            ws.transport.abort()
+        for message in messages:
+            # Per-connection write errors are logged by websockets itself and don't stop
+            # the fan-out (raise_exceptions needs Python 3.11+, which isn't required here)
             try:
-                await client.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                disconnected.add(client)
+                websockets.broadcast(self.clients, message)
             except Exception as e:
-                print(f"[WS] Error sending message to client: {e}")
-        self.clients -= disconnected
+                print(f"[WS] Error sending {what} to clients: {e}")
+
+    async def _handle_wifi_binary(self, ws, msg):
+        """Queue one binary WebSocket frame (BLOCK*CHANNELS raw float32) as WiFi audio"""
+        if len(msg) != WIFI_FRAME_BYTES:
+            await ws.send(f"error:wifi-stream-data:size-mismatch:{len(msg) // 4}:{WIFI_FRAME_SAMPLES}")
+            return
+        # Zero-copy view - wifi_push copies it into a ring slot
+        if self.player.wifi_push(np.frombuffer(msg, dtype=np.float32)):
+            await ws.send("ack:wifi-stream-data")
+        else:
+            await ws.send("error:wifi-stream-data:queue-full")
 
     async def handle_client(self, ws, path=None):
         print(f"[WS] New client {ws.remote_address}")
@@ -1285,9 +1745,14 @@ class WebSocketHandler:
             async for msg in ws:
                 await self.send_pending_highlights()
                 await self._process_queued_messages()
+
+                # Binary frames are raw float32 WiFi stream blocks - no JSON/base64 decode
+                if isinstance(msg, (bytes, bytearray)):
+                    await self._handle_wifi_binary(ws, msg)
+                    continue
                 
                 try:
-                    data = json.loads(msg)
+                    data = json_loads(msg)
                 except json.JSONDecodeError:
                     await ws.send("error:badjson")
                     continue
@@ -1329,7 +1794,7 @@ class WebSocketHandler:
                     control = data.get("control")
                     value = int(data.get("value", 5))
                     if control in ("user_strength", "user_neck", "user_back", "user_thighs", "user_legs"):
-                        setattr(self.player, control, value)
+                        self.player.set_user_control(control, value)
                         await ws.send(f"ack:set-user-control:{control}:{value}")
                         print(f"[USER] Updated {control} = {value}")
                     else:
@@ -1393,7 +1858,7 @@ class WebSocketHandler:
                             self.player.bt_mac_current = None
                         
                         # Remove the device
-                        success = self._remove_device_if_paired(mac)
+                        success = await self._remove_device_if_paired(mac)
                         
                         if success:
                             await ws.send(f"ack:bt-remove-device:{mac}")
@@ -1408,10 +1873,10 @@ class WebSocketHandler:
                         
                 elif action == "bt-forget-all":
                     try:
-                        ok, out = self._btctl("devices", "Paired")
-                        macs = re.findall(r"Device\s+([0-9A-F:]{17})", out or "", flags=re.I)
+                        ok, out = await self._btctl("devices", "Paired")
+                        macs = BT_MAC_RE.findall(out or "")
                         for m in macs:
-                            self._btctl("remove", m)
+                            await self._btctl("remove", m)
                         
                         # Stop BT read thread cleanly
                         if self.player.bt_read_running:
@@ -1432,11 +1897,14 @@ class WebSocketHandler:
                         self.bt_mac_current = None
                         
                         # Restart bluetooth service to clear all state
-                        subprocess.run(["sudo", "systemctl", "restart", "bluetooth"], check=False)
+                        try:
+                            await self._exec("sudo", "systemctl", "restart", "bluetooth", timeout=10)
+                        except Exception as e:
+                            print(f"[BT] bluetooth restart failed: {e}")
                         await asyncio.sleep(3)
                         
-                        self._btctl("pairable", "on")
-                        self._btctl("discoverable", "on")
+                        await self._btctl("pairable", "on")
+                        await self._btctl("discoverable", "on")
                         await ws.send("ack:bt-forget-all")
                         print("[BT] All paired devices removed and Bluetooth restarted")
                     except Exception as e:
@@ -1447,18 +1915,18 @@ class WebSocketHandler:
                     await ws.send("debug:BT-LIST-PAIRED-REACHED")
                     print(f"[BT] Received bt-list-paired request")
                     try:
-                        ok, out = self._btctl("devices", "Paired")
-                        connected_macs = set(self._list_a2dp_macs())
+                        ok, out = await self._btctl("devices", "Paired")
+                        connected_macs = set(await self._list_a2dp_macs())
                         print(f"[BT] Found {len(connected_macs)} connected devices")
 
                         devices = []
                         if ok:
-                            macs = re.findall(r'Device\s+([0-9A-F:]{17})\s+(.+)', out or "", flags=re.I)
+                            macs = BT_DEVICE_RE.findall(out or "")
                             print(f"[BT] Parsed {len(macs)} paired devices")
 
                             for mac, name in macs:
                                 # Query details for this device
-                                ok_i, out_i = self._btctl("info", mac)
+                                ok_i, out_i = await self._btctl("info", mac)
                                 # Keep only A2DP Source profile (phones/computers)
                                 if "Audio Source" not in (out_i or ""):
                                     print(f"[BT] Skipping {name} ({mac}) - not an A2DP source")
@@ -1483,11 +1951,11 @@ class WebSocketHandler:
                 # ---- ADDITIONAL BLUETOOTH / OUTPUT HANDLERS ----
 
                 elif action == "bt-scan-on":
-                    self._btctl("scan", "on")
+                    await self._btctl("scan", "on")
                     await ws.send("ack:bt-scan-on")
 
                 elif action == "bt-scan-off":
-                    self._btctl("scan", "off")
+                    await self._btctl("scan", "off")
                     await ws.send("ack:bt-scan-off")
 
                 elif action == "bt-disconnect-output":
@@ -1495,7 +1963,7 @@ class WebSocketHandler:
                     if not mac:
                         await ws.send("error:bt-disconnect-output:no-mac")
                     else:
-                        self._btctl("disconnect", mac)
+                        await self._btctl("disconnect", mac)
                         await ws.send(f"ack:bt-disconnect-output:{mac}")
 
                 elif action == "bt-forget-device":
@@ -1503,7 +1971,7 @@ class WebSocketHandler:
                     if not mac:
                         await ws.send("error:bt-forget-device:no-mac")
                     else:
-                        self._btctl("remove", mac)
+                        await self._btctl("remove", mac)
                         await ws.send(f"ack:bt-forget-device:{mac}")
 
                 elif action == "bt-list-outputs":
@@ -1612,16 +2080,7 @@ class WebSocketHandler:
 
                 elif action == "alsa-list-outputs":
                     try:
-                        r = subprocess.run(["aplay","-L"], capture_output=True, text=True, timeout=4)
-                        pcms=[]
-                        cur=None
-                        for line in (r.stdout or "").splitlines():
-                            if not line.strip(): continue
-                            if not line.startswith("  "):
-                                cur={"id": line.strip(), "desc": ""}
-                                pcms.append(cur)
-                            else:
-                                if cur: cur["desc"]+=line.strip()+" "
+                        pcms = await self._list_alsa_pcms()
                         await ws.send("ack:alsa-list-outputs:"+json.dumps({"pcms":pcms}))
                     except Exception as e:
                         await ws.send("error:alsa-list-outputs")
@@ -1632,6 +2091,7 @@ class WebSocketHandler:
                     if not alias or not pcm:
                         await ws.send("error:output-start:missing")
                     else:
+                        self._alsa_pcms_cache = None  # Output services add/remove PCMs
                         try:
                             outdir = "/etc/sonixscape/outputs.d"
                             os.makedirs(outdir, exist_ok=True)
@@ -1647,6 +2107,7 @@ class WebSocketHandler:
                     if not alias:
                         await ws.send("error:output-stop:missing")
                     else:
+                        self._alsa_pcms_cache = None
                         subprocess.run(["systemctl","disable","--now",f"sonixscape-output@{alias}.service"], check=False)
                         await ws.send(f"ack:output-stop:{alias}")
 
@@ -1655,6 +2116,7 @@ class WebSocketHandler:
                     if not alias:
                         await ws.send("error:output-forget:missing")
                     else:
+                        self._alsa_pcms_cache = None
                         subprocess.run(["systemctl","disable","--now",f"sonixscape-output@{alias}.service"], check=False)
                         try:
                             os.remove(f"/etc/sonixscape/outputs.d/{alias}.pcm")
@@ -1673,45 +2135,36 @@ class WebSocketHandler:
                     print("[WIFI] Starting WiFi audio streaming mode")
                     self.player.wifi_stream_enabled = True
                     self.player.wifi_stream_underruns = 0
+                    self.player.wifi_last_arrival = None
                     self.player.row = None
                     self.player.is_playing_sequence = False
-                    while not self.player.wifi_audio_queue.empty():
-                        try:
-                            self.player.wifi_audio_queue.get_nowait()
-                        except queue.Empty:
-                            break
+                    self.player.wifi_audio_ring.clear()
                     await ws.send("ack:wifi-stream-start")
                     
                 elif action == "wifi-stream-stop":
                     print("[WIFI] Stopping WiFi audio streaming mode")
                     self.player.wifi_stream_enabled = False
-                    while not self.player.wifi_audio_queue.empty():
-                        try:
-                            self.player.wifi_audio_queue.get_nowait()
-                        except queue.Empty:
-                            break
+                    self.player.wifi_audio_ring.clear()
                     await ws.send("ack:wifi-stream-stop")
                     
-                elif action == "wifi-stream-data":
+                elif action == "wifi-stream-data":  # Legacy JSON path - binary frames preferred
                     try:
                         audio_data = data.get("data")
                         
-                        if isinstance(audio_data, str):
-                            import base64
-                            binary = base64.b64decode(audio_data)
-                            audio_array = np.frombuffer(binary, dtype=np.float32)
-                        else:
-                            audio_array = np.array(audio_data, dtype=np.float32)
+                        # Payload is always a base64 string of raw float32 samples (the JSON
+                        # float-list form is no longer accepted). a2b_base64 takes the ASCII
+                        # str directly and, non-strict, decodes in a single pass
+                        binary = binascii.a2b_base64(audio_data)
                         
-                        expected_size = BLOCK * CHANNELS
-                        if len(audio_array) == expected_size:
-                            try:
-                                self.player.wifi_audio_queue.put_nowait(audio_array)
+                        # Size is checked on the raw bytes, before any array is built
+                        if len(binary) != WIFI_FRAME_BYTES:
+                            await ws.send(f"error:wifi-stream-data:size-mismatch:{len(binary) // 4}:{WIFI_FRAME_SAMPLES}")
+                        else:
+                            # Zero-copy view - wifi_push copies it into a ring slot
+                            if self.player.wifi_push(np.frombuffer(binary, dtype=np.float32)):
                                 await ws.send("ack:wifi-stream-data")
-                            except queue.Full:
+                            else:
                                 await ws.send("error:wifi-stream-data:queue-full")
-                        else:
-                            await ws.send(f"error:wifi-stream-data:size-mismatch:{len(audio_array)}:{expected_size}")
                             
                     except Exception as e:
                         print(f"[WIFI] Error processing stream data: {e}")
@@ -1727,48 +2180,49 @@ class WebSocketHandler:
         finally:
             self.clients.discard(ws)
 
-    def _remove_device_if_paired(self, mac: str) -> bool:
-        """Remove device completely - bluetoothctl, filesystem, and restart service"""
+    async def _remove_device_if_paired(self, mac: str, skip_presence_check: bool = False) -> bool:
+        """Remove device completely - bluetoothctl, filesystem, and restart service.
+        skip_presence_check: the caller just took mac from the paired list"""
         try:
             print(f"[BT] Starting complete removal of {mac}")
             
             # Step 1: Remove via bluetoothctl
-            ok, out = self._btctl("devices", "Paired")
-            if mac.upper() in out.upper():
+            if skip_presence_check:
+                paired = True
+            else:
+                ok, out = await self._btctl("devices", "Paired")
+                paired = mac.upper() in out.upper()
+            if paired:
                 print(f"[BT] Device found in paired list, removing...")
-                self._btctl("remove", mac)
-                time.sleep(0.5)
+                await self._btctl("remove", mac)
+                await asyncio.sleep(0.5)
             
             # Step 2: Remove pairing keys from filesystem
             mac_formatted = mac.upper().replace(':', '_')
             try:
                 # Use subprocess to find and remove directories
-                find_result = subprocess.run(
-                    ["sudo", "find", "/var/lib/bluetooth", "-type", "d", "-name", mac_formatted],
-                    capture_output=True,
-                    text=True,
+                _, find_out, _ = await self._exec(
+                    "sudo", "find", "/var/lib/bluetooth", "-type", "d", "-name", mac_formatted,
                     timeout=5
                 )
                 
-                for device_dir in find_result.stdout.strip().split('\n'):
+                for device_dir in find_out.strip().split('\n'):
                     if device_dir:  # Skip empty lines
                         print(f"[BT] Removing pairing keys from {device_dir}")
-                        subprocess.run(["sudo", "rm", "-rf", device_dir], timeout=3)
+                        await self._exec("sudo", "rm", "-rf", device_dir, timeout=3)
             except Exception as e:
                 print(f"[BT] Could not remove filesystem keys: {e}")
             
             # Step 3: Restart bluetooth to clear all cached state
             print("[BT] Restarting bluetooth service to clear cache")
-            subprocess.run(["sudo", "systemctl", "restart", "bluetooth"], timeout=10)
-            time.sleep(3)
+            await self._exec("sudo", "systemctl", "restart", "bluetooth", timeout=10)
+            await asyncio.sleep(3)
             
             # Step 4: Re-initialize agent and make discoverable
-            self._btctl("power", "on")
-            time.sleep(0.5)
-            self._btctl("agent", "NoInputNoOutput")
-            self._btctl("default-agent")
-            self._btctl("pairable", "on")
-            self._btctl("discoverable", "on")
+            await self._btctl("power", "on")
+            await asyncio.sleep(0.5)
+            if not await self._bt_setup_agent():
+                print("[BT] Adapter not fully re-initialized after removal")
             
             print(f"[BT] Successfully removed {mac} and cleared all pairing data")
             return True
@@ -1779,46 +2233,133 @@ class WebSocketHandler:
 
     async def _delayed_scan_off(self):
         await asyncio.sleep(8)
-        self._btctl("scan", "off")
-
-    def _list_a2dp_macs(self):
+        await self._btctl("scan", "off")
+
+    async def _list_a2dp_macs(self):
+        _, out = await self._btctl("devices", "Connected", timeout=3)
+        return BT_MAC_RE.findall(out)
+
+    async def _list_alsa_pcms(self):
+        """ALSA PCM names/descriptions from `aplay -L`. The listing walks every card, so
+        it is reused for ALSA_PCM_CACHE_TTL and runs off the event loop"""
+        now = time.monotonic()
+        hit = self._alsa_pcms_cache
+        if hit is not None and now - hit[0] < ALSA_PCM_CACHE_TTL:
+            return hit[1]
+        _, stdout, _ = await self._exec("aplay", "-L", timeout=4)
+        pcms=[]
+        cur=None
+        for line in stdout.splitlines():
+            if not line.strip(): continue
+            if not line.startswith("  "):
+                cur={"id": line.strip(), "desc": ""}
+                pcms.append(cur)
+            else:
+                if cur: cur["desc"]+=line.strip()+" "
+        self._alsa_pcms_cache = (now, pcms)
+        return pcms
+
+    async def _exec(self, *argv, timeout: float = 5) -> tuple[int, str, str]:
+        """Run a command as an asyncio subprocess so the event loop (and the WS audio
+        path) keeps running; returns (returncode, stdout, stderr), raises on timeout"""
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
         try:
-            r = subprocess.run(
-                ["bluetoothctl", "devices", "Connected"],
-                capture_output=True, text=True, timeout=3
-            )
-            return re.findall(r'Device\s+([0-9A-F:]{17})', r.stdout, flags=re.I)
-        except Exception as e:
-            print(f"[BT] Error checking bluetoothctl: {e}")
-            return []
-
-    def _btctl(self, *args) -> tuple[bool, str]:
+            out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except BaseException:
+            # Timed out or cancelled - don't leave the child running
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+            raise
+        return proc.returncode, out.decode(errors="replace"), err.decode(errors="replace")
+
+    async def _btctl(self, *args, timeout: float = 5) -> tuple[bool, str]:
+        # Read-only queries are reused for BTCTL_CACHE_TTL - the autoconnect loop asks the
+        # same questions several times per tick. Any other command may change state, so
+        # it drops the cache
+        now = time.monotonic()
+        if args and args[0] in BTCTL_QUERIES:
+            hit = self._btctl_cache.get(args)
+            if hit is not None and now - hit[0] < BTCTL_CACHE_TTL:
+                return hit[1]
+        else:
+            self._btctl_cache.clear()
         try:
-            r = subprocess.run(["bluetoothctl", *args], capture_output=True, text=True, timeout=5)
-            out = (r.stdout or "") + (r.stderr or "")
-            return (r.returncode == 0), out
+            rc, stdout, stderr = await self._exec("bluetoothctl", *args, timeout=timeout)
+            result = (rc == 0), stdout + stderr
+        except asyncio.TimeoutError:
+            return False, f"bluetoothctl {' '.join(args)} timed out"
         except Exception as e:
             return False, str(e)
+        if args and args[0] in BTCTL_QUERIES:
+            self._btctl_cache[args] = (now, result)
+        return result
+
+    async def _bt_setup_agent(self, power_on: bool = False) -> bool:
+        """Register the pairing agent and make the adapter pairable/discoverable. One
+        bluetoothctl call per step, so each waits for its D-Bus reply before the next
+        starts; then confirm the adapter actually took the settings"""
+        steps = [("agent", "NoInputNoOutput"), ("default-agent",),
+                 ("pairable", "on"), ("discoverable", "on")]
+        if power_on:
+            steps.append(("power", "on"))
+        for step in steps:
+            ok, out = await self._btctl(*step)
+            if not ok:
+                print(f"[BT] bluetoothctl {' '.join(step)} failed: {out.strip()}")
+        _, show = await self._btctl("show")
+        missing = [k for k in ("Powered", "Pairable", "Discoverable") if f"{k}: yes" not in show]
+        if missing:
+            print(f"[BT] Adapter setup incomplete: {', '.join(missing)} not on")
+            return False
+        return True
 
-    def _check_bt_device_connected(self, mac: str) -> bool:
+    async def _check_bt_device_connected(self, mac: str) -> bool:
+        _, out = await self._btctl("info", mac)
+        return "Connected: yes" in out
+
+    def _bt_adapter_powered(self):
+        """hci0 Adapter1.Powered read over the system bus - False while bluetoothd or the
+        adapter isn't up yet, None if D-Bus itself can't be used. Blocking dbus-python
+        calls: run it off the event loop (asyncio.to_thread)"""
+        if not DBUS_AVAILABLE or self._dbus_bus is False:
+            return None
+        try:
+            if self._dbus_bus is None:
+                self._dbus_bus = dbus.SystemBus()
+        except Exception as e:
+            print(f"[BT] System bus unavailable ({e}); using bluetoothctl")
+            self._dbus_bus = False  # Don't retry every poll
+            return None
         try:
-            r = subprocess.run(
-                ["bluetoothctl", "info", mac],
-                capture_output=True, text=True, timeout=5
+            props = dbus.Interface(
+                self._dbus_bus.get_object('org.bluez', '/org/bluez/hci0', introspect=False),
+                'org.freedesktop.DBus.Properties'
             )
-            return "Connected: yes" in r.stdout
-        except Exception:
+            # Short reply timeout: a hung bluetoothd counts as not ready instead of
+            # holding the caller for dbus' ~25s default
+            return bool(props.Get('org.bluez.Adapter1', 'Powered', timeout=2.0))
+        except dbus.exceptions.DBusException:
+            # ServiceUnknown (bluetoothd not running) or UnknownObject (no adapter yet)
             return False
 
     async def _wait_bt_daemons_ready(self, timeout: float = 20.0) -> bool:
         t0 = time.monotonic()
         while time.monotonic() - t0 < timeout:
             try:
-                s1 = subprocess.run(["systemctl", "is-active", "bluetooth"], capture_output=True, text=True, timeout=3)
-                ok1 = s1.stdout.strip() == "active"
-                _, show = self._btctl("show")
-                powered = "Powered: yes" in show
-                if ok1 and powered:
+                # bluetoothd answering on the bus also covers the is-active check
+                ready = await asyncio.to_thread(self._bt_adapter_powered)
+                if ready is None:
+                    _, active, _ = await self._exec("systemctl", "is-active", "bluetooth", timeout=3)
+                    ok1 = active.strip() == "active"
+                    _, show = await self._btctl("show")
+                    powered = "Powered: yes" in show
+                    ready = ok1 and powered
+                if ready:
                     return True
                 else:
                     print("[BT] Daemons not ready yet; retrying...")
@@ -1829,18 +2370,13 @@ class WebSocketHandler:
 
     async def _bt_autoconnect_loop(self, mac: str | None):
         print(f"[BT] autoconnect loop started with MAC: {mac}")
-        self._btctl("scan", "on"); asyncio.create_task(self._delayed_scan_off())
+        await self._btctl("scan", "on"); asyncio.create_task(self._delayed_scan_off())
         current_mac = None
         did_agent = False
         connection_failures = 0
         max_failures = 3
 
-        def _is_connected(m):
-            try:
-                r = subprocess.run(["bluetoothctl", "info", m], capture_output=True, text=True, timeout=5)
-                return "Connected: yes" in (r.stdout or "")
-            except Exception:
-                return False
+        _is_connected = self._check_bt_device_connected
 
         while self.bt_enabled:
             try:
@@ -1852,26 +2388,24 @@ class WebSocketHandler:
                         await asyncio.sleep(2)
                         continue
                     print("[BT] Setting up agent and making discoverable...")
-                    self._btctl("agent", "NoInputNoOutput")
-                    self._btctl("default-agent")
-                    self._btctl("pairable", "on")
-                    self._btctl("discoverable", "on")
-                    self._btctl("power", "on")
+                    if not await self._bt_setup_agent(power_on=True):
+                        await asyncio.sleep(2)
+                        continue
                     did_agent = True
                 
                 if auto_mode:
                     # First, check for paired but disconnected devices and remove them
-                    ok, paired_output = self._btctl("paired-devices")
+                    ok, paired_output = await self._btctl("paired-devices")
                     if ok:
-                        paired_macs = re.findall(r'Device\s+([0-9A-F:]{17})', paired_output or "", flags=re.I)
-                        connected_macs = self._list_a2dp_macs()
+                        paired_macs = BT_MAC_RE.findall(paired_output or "")
+                        connected_macs = await self._list_a2dp_macs()
                         
                         # Remove devices that are paired but not connected (stale pairings)
                         stale_found = False
                         for paired_mac in paired_macs:
                             if paired_mac not in connected_macs:
                                 print(f"[BT] Found stale paired device: {paired_mac}, removing completely")
-                                self._remove_device_if_paired(paired_mac)
+                                await self._remove_device_if_paired(paired_mac, skip_presence_check=True)
                                 stale_found = True
                         
                         # After cleanup, wait for bluetooth to stabilize
@@ -1879,26 +2413,21 @@ class WebSocketHandler:
                             await asyncio.sleep(5)
                     
                     # Only phones/computers that are A2DP *sources* (capture-capable)
-                    macs = self._list_a2dp_macs()          # ensure this returns CAPTURE list
+                    macs = await self._list_a2dp_macs()          # ensure this returns CAPTURE list
                     if not macs:
                         await asyncio.sleep(3); continue
                     pick = current_mac if current_mac in macs else macs[0]
                     if pick != current_mac:
-                        subprocess.run(["bluetoothctl", "trust", pick], check=False)
-                        if not _is_connected(pick):
-                            result = subprocess.run(
-                                ["bluetoothctl", "connect", pick], 
-                                capture_output=True, 
-                                text=True, 
-                                timeout=10
-                            )
+                        await self._btctl("trust", pick)
+                        if not await _is_connected(pick):
+                            ok, out = await self._btctl("connect", pick, timeout=10)
                             
                             # Check for authentication errors even in auto mode
-                            if result.returncode != 0:
-                                error_text = (result.stdout + result.stderr).lower()
+                            if not ok:
+                                error_text = out.lower()
                                 if any(err in error_text for err in ["incorrect pin", "authentication failed", "authentication rejected"]):
                                     print(f"[BT] Authentication error in auto mode - removing {pick}")
-                                    self._remove_device_if_paired(pick)
+                                    await self._remove_device_if_paired(pick)
                                     await asyncio.sleep(3)
                                     continue
                                     
@@ -1906,7 +2435,7 @@ class WebSocketHandler:
                     active_mac = pick
                     self.bt_mac_current = active_mac
 
-                    if not _is_connected(active_mac):
+                    if not await _is_connected(active_mac):
                         if self.player.bt_input:
                             try: self.player.bt_input.close()
                             except Exception: pass
@@ -1923,44 +2452,40 @@ class WebSocketHandler:
 
                     if need_setup:
                         print(f"[BT] (auto) setting up capture for {active_mac}...")
-                        ok = self.player._setup_bluetooth_input(active_mac)
+                        ok = await asyncio.to_thread(self.player._setup_bluetooth_input, active_mac)
                         await asyncio.sleep(3 if ok else 6)
                     else:
                         await asyncio.sleep(6)
                     continue
 
                 # Manual mode - specific MAC
-                if self.bt_mac_current and self.bt_mac_current not in self._list_a2dp_macs():
+                if self.bt_mac_current and self.bt_mac_current not in await self._list_a2dp_macs():
                     print(f"[BT] Forgetting {self.bt_mac_current}, device not present")
                     self.bt_mac_current = None
                     self.player.bt_input = None
                     self.player.bt_enabled = False
-                    self._btctl("discoverable", "on")
-                    self._btctl("pairable", "on")
+                    await self._btctl("discoverable", "on")
+                    await self._btctl("pairable", "on")
 
                 active_mac = mac
                 
-                if not _is_connected(active_mac):
+                connected = await _is_connected(active_mac)
+                if not connected:
                     connection_failures += 1
                     
                     # Try to connect
-                    result = subprocess.run(
-                        ["bluetoothctl", "connect", active_mac], 
-                        capture_output=True, 
-                        text=True, 
-                        timeout=10
-                    )
+                    ok, out = await self._btctl("connect", active_mac, timeout=10)
                     
                     # Check for authentication/PIN errors immediately
-                    if result.returncode != 0:
-                        error_text = (result.stdout + result.stderr).lower()
+                    if not ok:
+                        error_text = out.lower()
                         
                         # Immediate cleanup on authentication errors
                         if any(err in error_text for err in ["incorrect pin", "authentication failed", "authentication rejected"]):
                             print(f"[BT] Authentication error for {active_mac} - removing stale pairing immediately")
-                            self._remove_device_if_paired(active_mac)
-                            self._btctl("discoverable", "on")
-                            self._btctl("pairable", "on")
+                            await self._remove_device_if_paired(active_mac)
+                            await self._btctl("discoverable", "on")
+                            await self._btctl("pairable", "on")
                             connection_failures = 0  # Reset since we cleaned up
                             await asyncio.sleep(5)
                             continue
@@ -1970,19 +2495,22 @@ class WebSocketHandler:
                             # Check if too many failures
                             if connection_failures >= max_failures:
                                 print(f"[BT] {connection_failures} consecutive failures, cleaning up pairing")
-                                self._remove_device_if_paired(active_mac)
-                                self._btctl("discoverable", "on")
-                                self._btctl("pairable", "on")
+                                await self._remove_device_if_paired(active_mac)
+                                await self._btctl("discoverable", "on")
+                                await self._btctl("pairable", "on")
                                 connection_failures = 0
                                 await asyncio.sleep(5)
                                 continue
                     else:
                         # Connection succeeded, trust the device
-                        subprocess.run(["bluetoothctl", "trust", active_mac], check=False)
+                        await self._btctl("trust", active_mac)
                         connection_failures = 0  # Reset on success
                     
                     # Wait for connection to stabilize
                     await asyncio.sleep(2)
+
+                    # Re-probe only after a successful connect - a failed one leaves it down
+                    connected = ok and await _is_connected(active_mac)
                 else:
                     # Connection already exists - reset failure counter
                     connection_failures = 0
@@ -1990,8 +2518,8 @@ class WebSocketHandler:
                 self.bt_mac_current = active_mac
                 current_mac = active_mac
 
-                # Re-check connection status after connection attempt
-                if not _is_connected(active_mac):
+                # Connection status after any connection attempt
+                if not connected:
                     print(f"[BT] Device {active_mac} still not connected after attempt")
                     if self.player.bt_input:
                         try: self.player.bt_input.close()
@@ -2013,7 +2541,7 @@ class WebSocketHandler:
 
                 if need_setup:
                     print(f"[BT] (manual) setting up capture for {active_mac}...")
-                    ok = self.player._setup_bluetooth_input(active_mac)
+                    ok = await asyncio.to_thread(self.player._setup_bluetooth_input, active_mac)
                     await asyncio.sleep(3 if ok else 6)
                 else:
                     await asyncio.sleep(6)
@@ -2030,6 +2558,30 @@ class WebSocketHandler:
         return mac is None or str(mac).strip().lower() == "auto"
 
     def _apply_bt_gain(self, bt_gain: float):
+        """Persist bt_gain to mix.json. A slider drag sends a burst of set-mix messages,
+        so updates are coalesced into one write per 100ms, done off the event loop"""
+        if self._pending_bt_gain is not None and abs(bt_gain - self._pending_bt_gain) < 1e-4:
+            return
+        self._pending_bt_gain = bt_gain
+        if self._mix_flush_task is None:
+            self._mix_flush_task = asyncio.create_task(self._flush_mix())
+
+    async def _flush_mix(self):
+        try:
+            while True:
+                await asyncio.sleep(0.1)
+                bt_gain = self._pending_bt_gain
+                try:
+                    await asyncio.to_thread(self._write_mix, bt_gain)
+                except Exception as e:
+                    print(f"[MIX] Could not write mix.json: {e}")
+                # Changed again while writing - go round once more
+                if self._pending_bt_gain == bt_gain:
+                    break
+        finally:
+            self._mix_flush_task = None
+
+    def _write_mix(self, bt_gain: float):
         mix_path = Path("/opt/sonixscape/webui/mix.json")
         cur = {}
         if mix_path.exists():
@@ -2060,15 +2612,15 @@ class WebSocketHandler:
         except Exception:
             pass
 
-    def _bt_start(self, mac: str | None, clear_first: bool = True):
+    async def _bt_start(self, mac: str | None, clear_first: bool = True):
         """Start BT with optional cleanup of all pairings"""
         if clear_first:
             print("[BT] Clearing all pairings for fresh start")
-            ok, out = self._btctl("devices", "Paired")
+            ok, out = await self._btctl("devices", "Paired")
             if ok:
-                macs = re.findall(r"Device\s+([0-9A-F:]{17})", out or "", flags=re.I)
+                macs = BT_MAC_RE.findall(out or "")
                 for m in macs:
-                    self._remove_device_if_paired(m)
+                    await self._remove_device_if_paired(m, skip_presence_check=True)
         
         self.bt_mac = (mac or "auto")
         self.bt_enabled = True
@@ -2157,34 +2709,23 @@ class WebSocketHandler:
         self._apply_bt_gain(bt_gain)
         await ws.send("ack:set-mix")
 
-    def queue_highlight(self, row_index): self.highlight_queue.append(row_index)
-    def queue_clear_highlight(self): self.clear_highlight_pending = True
-
-    async def send_clear_highlight(self):
-        message = "clear:highlight"
-        disconnected = set()
-        for client in self.clients:
-            try: await client.send(message)
-            except websockets.exceptions.ConnectionClosed: disconnected.add(client)
-            except Exception as e: print(f"[WS] Error sending clear highlight: {e}")
-        self.clients -= disconnected
-
-    async def send_highlight(self, row_index):
-        message = f"highlight:{row_index}"
-        disconnected = set()
-        for client in self.clients:
-            try: await client.send(message)
-            except websockets.exceptions.ConnectionClosed: disconnected.add(client)
-            except Exception as e: print(f"[WS] Error sending highlight: {e}")
-        self.clients -= disconnected
+    def queue_highlight(self, row_index): self.highlight_queue.append(row_index); self._wake_sender()
+    def queue_clear_highlight(self): self.clear_highlight_pending = True; self._wake_sender()
 
     async def send_pending_highlights(self):
+        """Fan out this tick's pending clear and highlight frames in a single pass"""
+        messages = []
         if self.clear_highlight_pending:
-            await self.send_clear_highlight()
             self.clear_highlight_pending = False
+            messages.append("clear:highlight")
+        # Everything queued since the last tick goes out as one "highlight:i,j,k" frame
+        rows = []
         while self.highlight_queue:
-            row_index = self.highlight_queue.pop(0)
-            await self.send_highlight(row_index)
+            rows.append(self.highlight_queue.popleft())
+        if rows:
+            messages.append("highlight:" + ",".join(map(str, rows)))
+        if messages:
+            await self._send_batch_to_all_clients(messages, "highlight")
 
 ws_handler = WebSocketHandler()
 
@@ -2235,26 +2776,46 @@ signal.signal(signal.SIGTERM, _sigterm_handler)
 signal.signal(signal.SIGINT, _sigterm_handler)
 
 async def monitor_device():
-    last_available = None
-    while True:
-        await asyncio.sleep(1.0)
-        desired = "ICUSBAUDIO7D"
-        if desired != getattr(ws_handler.player, "output_device_hint", ""):
-            print(f"[AUDIO] switching output to {desired}")
-            ws_handler.player.output_device_hint = desired
-            ws_handler.player.ensure_stream()
-            last_available = None
-
-        now_available = ws_handler.player.is_device_available()
-        if now_available != last_available:
-            last_available = now_available
-            ws_handler.player.ensure_stream()
+    """Open the output once, then re-run ensure_stream only when udev reports a sound
+    card being added (e.g. the USB DAC re-plugged) - no periodic polling. ensure_stream
+    can spawn aplay and join the writer thread, so it always runs in the executor"""
+    player = ws_handler.player
+    await asyncio.sleep(1.0)
+    await asyncio.to_thread(player.ensure_stream)
+    if not PYUDEV_AVAILABLE:
+        return
+
+    loop = asyncio.get_running_loop()
+
+    def _on_udev_event(device):
+        # One add per card; its pcm/control nodes follow as separate events
+        if device.action == "add" and device.sys_name.startswith("card"):
+            print(f"[AUDIO] Sound card added ({device.sys_name}), re-checking output")
+            # Hand off to the executor via the loop: hotplug must not stall the WS loop
+            loop.call_soon_threadsafe(loop.run_in_executor, None, player.ensure_stream)
+
+    try:
+        monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+        monitor.filter_by("sound")
+        observer = pyudev.MonitorObserver(monitor, callback=_on_udev_event, name="udev-sound")
+        observer.daemon = True
+        observer.start()
+        player._udev_observer = observer  # Keep the observer thread referenced
+    except Exception as e:
+        print(f"[AUDIO] udev monitor failed: {e}")
 
 async def highlight_sender():
+    """Flush highlights and queued messages as soon as something is queued, instead of
+    polling every 100ms"""
+    event = asyncio.Event()
+    event.set()  # First pass picks up anything queued before the loop was known
+    ws_handler._outbox_event = event
+    ws_handler._outbox_loop = asyncio.get_running_loop()
     while True:
+        await event.wait()
+        event.clear()  # Cleared before draining: a queue meanwhile sets it again
         await ws_handler.send_pending_highlights()
         await ws_handler._process_queued_messages()  # ? ADD THIS LINE
-        await asyncio.sleep(0.1)
 
 async def main():
     asyncio.create_task(monitor_device()); asyncio.create_task(highlight_sender())
@@ -2267,15 +2828,20 @@ async def main():
                 ping_interval=None,
                 ping_timeout=None,
                 close_timeout=None,
-                max_size=None
+                # Bounds what one inbound frame can make us buffer; the largest legitimate
+                # frames are WiFi audio (WIFI_FRAME_BYTES) and a full sequence's JSON
+                max_size=WS_MAX_MESSAGE,
+                # Messages are short control strings and raw PCM, neither compresses
+                # usefully; permessage-deflate would only cost zlib CPU and per-connection memory
+                compression=None
             ):
                 print(f"[WS] Listening on :{PORT}")
-                ws_handler._bt_start("auto", clear_first=False)  # Don't clear on service start
+                await ws_handler._bt_start("auto", clear_first=False)  # Don't clear on service start
                 await asyncio.Future()
         except OSError as e:
             if getattr(e,"errno",None)==98: print(f"[WARN] Port {PORT} busy; retrying"); await asyncio.sleep(2); continue
             raise
 
 if __name__=="__main__":
-    try: asyncio.run(main())
+    try: (uvloop.run if UVLOOP_AVAILABLE else asyncio.run)(main())
     except KeyboardInterrupt: pass